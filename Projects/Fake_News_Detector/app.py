@@ -1,9 +1,12 @@
 import streamlit as st
-import pickle
 import pandas as pd
 import numpy as np
 from io import StringIO
 import os
+import tempfile
+from inference import BatchPredictor, label_names, load_artifacts
+from prediction_cache import PredictionCache, model_fingerprint
+from csv_stream import detect_text_column, read_columns, stream_predictions_csv
 
 # Set page config
 st.set_page_config(
@@ -43,17 +46,15 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Load model and vectorizer
+# Load model and vectorizer; a new fingerprint (retrained model) reloads them
 @st.cache_resource
-def load_model():
-    with open('models/model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    with open('models/tfidf.pkl', 'rb') as f:
-        tfidf = pickle.load(f)
-    return model, tfidf
+def load_model(fingerprint):
+    model, tfidf = load_artifacts()
+    predictor = BatchPredictor(model, tfidf, cache=PredictionCache(fingerprint=fingerprint))
+    return model, tfidf, predictor
 
 try:
-    model, tfidf = load_model()
+    model, tfidf, predictor = load_model(model_fingerprint())
 except FileNotFoundError:
     st.error("❌ Model files not found. Please run the training script first.")
     st.stop()
@@ -77,15 +78,9 @@ with tab1:
     
     if st.button("🔍 Analyze Headline", use_container_width=True):
         if headline.strip():
-            # Preprocess
-            headline_clean = headline.lower().strip()
-            
-            # Vectorize
-            headline_tfidf = tfidf.transform([headline_clean])
-            
-            # Predict
-            prediction = model.predict(headline_tfidf)[0]
-            confidence = model.predict_proba(headline_tfidf)[0]
+            # Preprocess, vectorize and predict (repeated headlines hit the cache)
+            confidence = predictor.predict_proba([headline])[0]
+            prediction = model.classes_[confidence.argmax()]
             
             # Display results
             col1, col2 = st.columns(2)
@@ -142,16 +137,69 @@ with tab2:
         help="CSV should have a 'headline' or 'text' column"
     )
     
-    if uploaded_file is not None:
+    streaming_mode = st.checkbox(
+        "Streaming mode for very large files",
+        help="Reads and scores the file in chunks, loading only the text column. "
+             "Results contain the text column plus the predictions."
+    )
+    
+    if uploaded_file is not None and streaming_mode:
+        # Only the header is parsed up front; rows are read chunk by chunk
+        text_column = detect_text_column(read_columns(uploaded_file))
+        
+        if text_column is None:
+            st.error(f"❌ CSV must contain one of these columns: headline, text, title, or news")
+            st.write("Available columns:", read_columns(uploaded_file))
+        else:
+            st.success(f"✓ Found '{text_column}' column")
+            
+            if st.button("🔍 Analyze All Headlines", use_container_width=True):
+                progress_bar = st.progress(0)
+                
+                # Replace the previous run's results file for this session
+                previous_path = st.session_state.pop('stream_results_path', None)
+                if previous_path and os.path.exists(previous_path):
+                    os.remove(previous_path)
+                with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+                    results_path = tmp.name
+                st.session_state['stream_results_path'] = results_path
+                
+                summary = stream_predictions_csv(
+                    uploaded_file, results_path, predictor,
+                    text_column=text_column, progress_callback=progress_bar.progress
+                )
+                
+                # Display a preview instead of the full frame
+                st.subheader("Results (first 1,000 rows)")
+                st.dataframe(pd.read_csv(results_path, nrows=1000), use_container_width=True)
+                
+                # Summary statistics
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Total Headlines", summary['rows'])
+                with col2:
+                    st.metric("Real News", summary['real'])
+                with col3:
+                    st.metric("Fake News", summary['fake'])
+                with col4:
+                    st.metric("Avg Confidence", f"{summary['avg_confidence']:.2f}%")
+                
+                # Download results straight from the file on disk
+                with open(results_path, 'rb') as f:
+                    st.download_button(
+                        label="📥 Download Results as CSV",
+                        data=f,
+                        file_name="fake_news_results.csv",
+                        mime="text/csv",
+                        use_container_width=True
+                    )
+    
+    elif uploaded_file is not None:
         # Read CSV
         df = pd.read_csv(uploaded_file)
         
         # Find text column
-        text_column = None
-        for col in ['headline', 'text', 'title', 'news']:
-            if col in df.columns:
-                text_column = col
-                break
+        text_column = detect_text_column(df.columns)
         
         if text_column is None:
             st.error(f"❌ CSV must contain one of these columns: headline, text, title, or news")
@@ -160,25 +208,15 @@ with tab2:
             st.success(f"✓ Found '{text_column}' column with {len(df)} headlines")
             
             if st.button("🔍 Analyze All Headlines", use_container_width=True):
-                # Process all headlines
+                # Process all headlines in chunks, updating progress once per chunk
                 progress_bar = st.progress(0)
-                predictions = []
-                confidences = []
-                
-                for idx, headline in enumerate(df[text_column]):
-                    headline_clean = str(headline).lower().strip()
-                    headline_tfidf = tfidf.transform([headline_clean])
-                    pred = model.predict(headline_tfidf)[0]
-                    conf = model.predict_proba(headline_tfidf)[0]
-                    
-                    predictions.append("Real" if pred == 1 else "Fake")
-                    confidences.append(max(conf))
-                    
-                    progress_bar.progress((idx + 1) / len(df))
+                labels, confidences = predictor.predict(
+                    df[text_column], progress_callback=progress_bar.progress
+                )
                 
                 # Add results to dataframe
                 results_df = df.copy()
-                results_df['Prediction'] = predictions
+                results_df['Prediction'] = label_names(labels)
                 results_df['Confidence'] = (confidences * 100).round(2)
                 
                 # Display results
@@ -250,3 +288,17 @@ with tab3:
     2. **Batch Upload**: Upload a CSV file with multiple headlines for analysis
     3. **Download Results**: Export predictions for further analysis
     """)
+
+# ============ SIDEBAR: Cache Statistics ============
+with st.sidebar:
+    st.header("Prediction Cache")
+    cache_stats = predictor.cache.stats()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Hits", cache_stats['hits'])
+    with col2:
+        st.metric("Misses", cache_stats['misses'])
+    st.caption(
+        f"Hit rate {cache_stats['hit_rate'] * 100:.1f}% · "
+        f"{cache_stats['size']:,}/{cache_stats['maxsize']:,} entries"
+    )
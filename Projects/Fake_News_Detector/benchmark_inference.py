@@ -0,0 +1,93 @@
+"""
+Batch Inference Benchmark
+Compares rows/sec of the per-row scoring loop against BatchPredictor.
+
+Usage:
+    python benchmark_inference.py --rows 200000 --chunk-size 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from inference import BatchPredictor, load_artifacts, normalize_headline
+
+WORDS = (
+    "scientists discover new species government secret vaccine trial market "
+    "climate agreement aliens spotted city miracle cure hidden study reveals "
+    "benefits exercise celebrity accident conspiracy drones economy towers"
+).split()
+
+
+def make_headlines(count: int, seed: int = 42) -> list:
+    """Generate synthetic headlines from a small vocabulary."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(5, 12, size=count)
+    return [" ".join(rng.choice(WORDS, size=n)) for n in lengths]
+
+
+def load_or_fit_model():
+    """Load the trained artifacts, or fit a throwaway model if they are missing."""
+    try:
+        return load_artifacts()
+    except FileNotFoundError:
+        pass
+
+    texts = make_headlines(2000, seed=7)
+    labels = np.array([len(t) % 2 for t in texts])
+    tfidf = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
+    model = LogisticRegression(max_iter=1000, random_state=42)
+    model.fit(tfidf.fit_transform(texts), labels)
+    return model, tfidf
+
+
+def per_row_loop(model, tfidf, headlines):
+    """Reproduce the original one-row-at-a-time batch tab loop."""
+    predictions = []
+    confidences = []
+    for headline in headlines:
+        headline_tfidf = tfidf.transform([normalize_headline(headline)])
+        pred = model.predict(headline_tfidf)[0]
+        conf = model.predict_proba(headline_tfidf)[0]
+        predictions.append(pred)
+        confidences.append(max(conf))
+    return np.array(predictions), np.array(confidences)
+
+
+def time_call(func, *args, **kwargs):
+    """Return (result, elapsed seconds) for a single call."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch headline scoring")
+    parser.add_argument("--rows", type=int, default=200000, help="Rows for the batched path")
+    parser.add_argument("--loop-rows", type=int, default=5000,
+                        help="Rows for the per-row loop (extrapolated; the full run takes minutes)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    model, tfidf = load_or_fit_model()
+    headlines = make_headlines(args.rows)
+    loop_rows = min(args.loop_rows, args.rows)
+
+    (loop_labels, _), loop_time = time_call(per_row_loop, model, tfidf, headlines[:loop_rows])
+    predictor = BatchPredictor(model, tfidf, chunk_size=args.chunk_size)
+    (labels, _), batch_time = time_call(predictor.predict, headlines)
+
+    assert np.array_equal(loop_labels, labels[:loop_rows]), "batched labels differ from per-row loop"
+
+    loop_rate = loop_rows / loop_time
+    batch_rate = args.rows / batch_time
+    print(f"Per-row loop: {loop_rows:>9,} rows in {loop_time:8.2f}s -> {loop_rate:>12,.0f} rows/sec")
+    print(f"Batched:      {args.rows:>9,} rows in {batch_time:8.2f}s -> {batch_rate:>12,.0f} rows/sec")
+    print(f"Speedup:      {batch_rate / loop_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
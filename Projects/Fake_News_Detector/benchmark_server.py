@@ -0,0 +1,69 @@
+"""
+Scoring Server Load Test
+Measures single-headline latency percentiles and throughput against serve.py.
+
+Usage:
+    python serve.py --workers 4 &
+    python benchmark_server.py --requests 20000 --concurrency 16
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+
+import numpy as np
+
+from benchmark_inference import make_headlines
+
+
+def client_loop(host: str, port: int, headlines: list, latencies: list):
+    """Send headlines one by one over a keep-alive connection, recording latency."""
+    conn = http.client.HTTPConnection(host, port)
+    headers = {"Content-Type": "application/json"}
+    for headline in headlines:
+        body = json.dumps({"headline": headline})
+        start = time.perf_counter()
+        conn.request("POST", "/predict", body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"Server returned {response.status}")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scoring server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    headlines = make_headlines(args.requests)
+    per_client = [headlines[i::args.concurrency] for i in range(args.concurrency)]
+    results = [[] for _ in range(args.concurrency)]
+
+    # Warm up the connection pool and the model
+    client_loop(args.host, args.port, headlines[:50], [])
+
+    threads = [threading.Thread(target=client_loop, args=(args.host, args.port, chunk, latencies))
+               for chunk, latencies in zip(per_client, results)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([np.array(r) for r in results]) * 1000
+    print(f"Requests:    {len(latencies):,} with {args.concurrency} concurrent clients")
+    print(f"Throughput:  {len(latencies) / elapsed:,.0f} req/sec")
+    print(f"Latency p50: {np.percentile(latencies, 50):.2f} ms")
+    print(f"Latency p99: {np.percentile(latencies, 99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
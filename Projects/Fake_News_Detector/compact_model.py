@@ -0,0 +1,246 @@
+"""
+Compact Model Artifact Module
+Exports the TF-IDF vectorizer and logistic regression model as memory-mappable
+NumPy arrays and scores headlines straight from the mapped buffers.
+
+Layout of the export directory:
+    meta.json    analyzer settings, classes and intercept
+    vocab.npy    vocabulary terms as sorted UTF-8 byte strings
+    idf.npy      IDF weight per term, in vocabulary order
+    coef.npy     classifier coefficient per term, in vocabulary order
+
+Loading needs neither pickle nor scikit-learn, and every worker on a host
+shares the same page-cache pages for the arrays.
+
+Usage:
+    python compact_model.py              # export models/*.pkl to models/compact
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from typing import List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+COMPACT_DIR = 'compact'
+FORMAT_VERSION = 1
+
+
+def export_compact(model, tfidf, out_dir: str):
+    """
+    Write a fitted TfidfVectorizer and binary LogisticRegression as arrays.
+
+    Args:
+        model: Fitted binary linear classifier with coef_, intercept_ and classes_
+        tfidf: Fitted TfidfVectorizer using the built-in word analyzer
+        out_dir: Destination directory (created if missing)
+
+    Raises:
+        ValueError: If the vectorizer or model cannot be represented
+    """
+    if not hasattr(tfidf, 'vocabulary_') or not hasattr(tfidf, 'idf_'):
+        raise ValueError("Compact export requires a fitted TfidfVectorizer with a vocabulary")
+    if tfidf.analyzer != 'word' or tfidf.tokenizer is not None or tfidf.preprocessor is not None:
+        raise ValueError("Compact export only supports the built-in word analyzer")
+    if callable(tfidf.strip_accents):
+        raise ValueError("Compact export does not support a callable strip_accents")
+    if len(model.classes_) != 2 or model.coef_.shape[0] != 1:
+        raise ValueError("Compact export only supports binary linear classifiers")
+
+    # Sort terms by their UTF-8 bytes so lookups can binary-search the mapped array
+    terms = sorted(tfidf.vocabulary_.items(), key=lambda item: item[0].encode('utf-8'))
+    order = np.array([index for _, index in terms], dtype=np.int64)
+    vocab = np.array([term.encode('utf-8') for term, _ in terms], dtype=np.bytes_)
+
+    stop_words = tfidf.get_stop_words()
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'lowercase': bool(tfidf.lowercase),
+        'strip_accents': tfidf.strip_accents,
+        'token_pattern': tfidf.token_pattern,
+        'ngram_range': list(tfidf.ngram_range),
+        'stop_words': sorted(stop_words) if stop_words else None,
+        'binary': bool(tfidf.binary),
+        'sublinear_tf': bool(tfidf.sublinear_tf),
+        'norm': tfidf.norm,
+        'classes': [int(c) for c in model.classes_],
+        'intercept': float(model.intercept_[0]),
+        'n_features': int(len(vocab)),
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, 'vocab.npy'), vocab)
+    np.save(os.path.join(out_dir, 'idf.npy'), np.ascontiguousarray(tfidf.idf_[order], dtype=np.float64))
+    np.save(os.path.join(out_dir, 'coef.npy'), np.ascontiguousarray(model.coef_[0][order], dtype=np.float64))
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+def _strip_accents(text: str, mode) -> str:
+    """Mirror scikit-learn's 'unicode' and 'ascii' accent stripping."""
+    if mode == 'ascii':
+        return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    normalized = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in normalized if not unicodedata.combining(c))
+
+
+class CompactVectorizer:
+    """TF-IDF transform backed by memory-mapped vocabulary and IDF arrays."""
+
+    def __init__(self, meta: dict, vocab: np.ndarray, idf: np.ndarray):
+        self.meta = meta
+        self.vocab = vocab
+        self.idf = idf
+        self.token_pattern = re.compile(meta['token_pattern'])
+        self.min_n, self.max_n = meta['ngram_range']
+        self.stop_words = frozenset(meta['stop_words'] or ())
+
+    def analyze(self, doc: str) -> List[str]:
+        """Split a document into terms exactly like the exported vectorizer."""
+        if self.meta['strip_accents']:
+            doc = _strip_accents(doc, self.meta['strip_accents'])
+        if self.meta['lowercase']:
+            doc = doc.lower()
+        tokens = self.token_pattern.findall(doc)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+        if self.max_n == 1:
+            return tokens
+
+        terms = list(tokens) if self.min_n == 1 else []
+        for n in range(max(2, self.min_n), min(self.max_n, len(tokens)) + 1):
+            terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, docs) -> sparse.csr_matrix:
+        """
+        Vectorize documents into a normalized TF-IDF matrix.
+
+        Args:
+            docs: Iterable of strings
+
+        Returns:
+            CSR matrix of shape (n_docs, n_features) in vocabulary order
+        """
+        terms = []
+        rows = []
+        n_docs = 0
+        for n_docs, doc in enumerate(docs, start=1):
+            doc_terms = self.analyze(doc)
+            terms.extend(t.encode('utf-8') for t in doc_terms)
+            rows.extend([n_docs - 1] * len(doc_terms))
+
+        n_features = len(self.vocab)
+        if not terms:
+            return sparse.csr_matrix((n_docs, n_features))
+
+        query = np.array(terms, dtype=np.bytes_)
+        cols = np.minimum(np.searchsorted(self.vocab, query), n_features - 1)
+        known = self.vocab[cols] == query
+        rows = np.asarray(rows, dtype=np.int64)[known]
+        cols = cols[known]
+
+        X = sparse.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=(n_docs, n_features))
+        X.sum_duplicates()
+        if self.meta['binary']:
+            X.data[:] = 1.0
+        elif self.meta['sublinear_tf']:
+            np.log(X.data, out=X.data)
+            X.data += 1.0
+        X.data *= self.idf[X.indices]
+
+        if self.meta['norm'] in ('l1', 'l2'):
+            row_ids = np.repeat(np.arange(n_docs), np.diff(X.indptr))
+            weights = X.data ** 2 if self.meta['norm'] == 'l2' else np.abs(X.data)
+            norms = np.bincount(row_ids, weights=weights, minlength=n_docs)
+            if self.meta['norm'] == 'l2':
+                norms = np.sqrt(norms)
+            X.data /= norms[row_ids]
+        return X
+
+
+class CompactClassifier:
+    """Binary logistic regression scored against a memory-mapped coefficient vector."""
+
+    def __init__(self, meta: dict, coef: np.ndarray):
+        self.coef = coef
+        self.intercept = meta['intercept']
+        self.classes_ = np.array(meta['classes'])
+
+    def decision_function(self, X) -> np.ndarray:
+        return X @ self.coef + self.intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def has_compact(model_dir: str) -> bool:
+    """Check whether a compact export exists under model_dir."""
+    return os.path.exists(os.path.join(model_dir, COMPACT_DIR, 'meta.json'))
+
+
+def load_compact(model_dir: str) -> Tuple[CompactClassifier, CompactVectorizer]:
+    """
+    Load a compact export with its arrays memory-mapped read-only.
+
+    Args:
+        model_dir: Directory containing the compact/ export
+
+    Returns:
+        Tuple of (model, tfidf) usable wherever the pickled pair is
+
+    Raises:
+        FileNotFoundError: If the export is missing
+        ValueError: If the export was written by an unsupported version
+    """
+    path = os.path.join(model_dir, COMPACT_DIR)
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact model format: {meta.get('format_version')}")
+
+    vocab = np.load(os.path.join(path, 'vocab.npy'), mmap_mode='r')
+    idf = np.load(os.path.join(path, 'idf.npy'), mmap_mode='r')
+    coef = np.load(os.path.join(path, 'coef.npy'), mmap_mode='r')
+    return CompactClassifier(meta, coef), CompactVectorizer(meta, vocab, idf)
+
+
+def main():
+    from inference import MODEL_DIR, load_artifacts
+
+    parser = argparse.ArgumentParser(description="Export pickled artifacts to the compact format")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model, tfidf = load_artifacts(args.model_dir, prefer_compact=False)
+    pickle_time = time.perf_counter() - start
+
+    export_compact(model, tfidf, os.path.join(args.model_dir, COMPACT_DIR))
+
+    start = time.perf_counter()
+    compact_model, compact_tfidf = load_compact(args.model_dir)
+    compact_time = time.perf_counter() - start
+
+    # Verify the export scores the training vocabulary identically
+    sample = list(tfidf.vocabulary_)[:1000] or ['']
+    expected = model.predict_proba(tfidf.transform(sample))
+    actual = compact_model.predict_proba(compact_tfidf.transform(sample))
+    if not np.allclose(expected, actual, atol=1e-9):
+        raise SystemExit("❌ Compact model predictions differ from the pickled model")
+
+    print(f"Load time: pickle {pickle_time * 1000:.1f} ms, compact {compact_time * 1000:.1f} ms")
+    print(f"✓ Compact model saved to {os.path.join(args.model_dir, COMPACT_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Batched Inference Module
+Scores headlines in chunks with one sparse transform and one predict_proba call per chunk.
+"""
+
+import os
+import pickle
+from typing import Callable, Iterable, Optional, Tuple
+
+import numpy as np
+
+from compact_model import has_compact, load_compact
+
+LABEL_NAMES = {1: "Real", 0: "Fake"}
+DEFAULT_CHUNK_SIZE = 10000
+MODEL_DIR = 'models'
+
+
+def load_artifacts(model_dir: str = MODEL_DIR, prefer_compact: bool = True):
+    """
+    Load the trained classifier and vectorizer.
+
+    The memory-mapped compact export is used when present, since it loads
+    in milliseconds and shares pages between worker processes.
+
+    Args:
+        model_dir: Directory containing model.pkl and tfidf.pkl
+        prefer_compact: Load models/compact/ instead of the pickles if it exists
+
+    Returns:
+        Tuple of (model, tfidf)
+
+    Raises:
+        FileNotFoundError: If either artifact is missing
+    """
+    if prefer_compact and has_compact(model_dir):
+        return load_compact(model_dir)
+    with open(os.path.join(model_dir, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(model_dir, 'tfidf.pkl'), 'rb') as f:
+        tfidf = pickle.load(f)
+    return model, tfidf
+
+
+def normalize_headline(headline) -> str:
+    """Apply the same preprocessing used at training time."""
+    return str(headline).lower().strip()
+
+
+def dedupe(values: list) -> Tuple[list, np.ndarray]:
+    """
+    Collapse repeated values while keeping first-seen order.
+
+    Returns:
+        Tuple of (unique values, codes) where values[i] == uniques[codes[i]]
+    """
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values),
+                        dtype=np.int64, count=len(values))
+    return list(index), codes
+
+
+class BatchPredictor:
+    """Vectorize and classify headlines in fixed-size chunks."""
+
+    def __init__(self, model, tfidf, chunk_size: int = DEFAULT_CHUNK_SIZE, cache=None):
+        """
+        Initialize the predictor.
+
+        Args:
+            model: Fitted classifier exposing predict_proba and classes_
+            tfidf: Fitted vectorizer exposing transform
+            chunk_size: Number of rows vectorized and scored per call
+            cache: Optional PredictionCache consulted before scoring
+        """
+        self.model = model
+        self.tfidf = tfidf
+        self.chunk_size = max(1, int(chunk_size))
+        self.cache = cache
+
+    def _score(self, texts: list) -> np.ndarray:
+        """Score normalized, de-duplicated texts, consulting the cache if present."""
+        n_classes = len(self.model.classes_)
+        if not texts:
+            return np.empty((0, n_classes))
+        if self.cache is None:
+            return self.model.predict_proba(self.tfidf.transform(texts))
+
+        proba = np.empty((len(texts), n_classes))
+        missing = []
+        for i, text in enumerate(texts):
+            row = self.cache.get(text)
+            if row is None:
+                missing.append(i)
+            else:
+                proba[i] = row
+
+        if missing:
+            scored = self.model.predict_proba(self.tfidf.transform([texts[i] for i in missing]))
+            proba[missing] = scored
+            for i, row in zip(missing, scored):
+                self.cache.put(texts[i], row)
+        return proba
+
+    def predict_proba(self, headlines: Iterable) -> np.ndarray:
+        """
+        Score a single chunk of headlines.
+
+        Duplicate headlines within the chunk are scored only once.
+
+        Args:
+            headlines: Raw headline values (any type, converted with str())
+
+        Returns:
+            Array of shape (n, n_classes) ordered like model.classes_
+        """
+        uniques, codes = dedupe([normalize_headline(h) for h in headlines])
+        return self._score(uniques)[codes]
+
+    def predict(self, headlines, progress_callback: Optional[Callable[[float], None]] = None
+                ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify all headlines, chunk by chunk.
+
+        Rows are de-duplicated across the whole input before chunking, so a
+        headline repeated anywhere in the column is vectorized once. The
+        label is taken from the argmax of the probabilities, so the
+        classifier is only evaluated once per chunk.
+
+        Args:
+            headlines: Sequence of raw headline values
+            progress_callback: Called with the completed fraction after each chunk
+
+        Returns:
+            Tuple of (labels, confidences) where confidences are the
+            maximum class probability for each row
+        """
+        uniques, codes = dedupe([normalize_headline(h) for h in headlines])
+        total = len(uniques)
+        unique_labels = np.empty(total, dtype=self.model.classes_.dtype)
+        unique_confidences = np.empty(total, dtype=np.float64)
+
+        for start in range(0, total, self.chunk_size):
+            end = min(start + self.chunk_size, total)
+            proba = self._score(uniques[start:end])
+            best = proba.argmax(axis=1)
+            unique_labels[start:end] = self.model.classes_[best]
+            unique_confidences[start:end] = proba[np.arange(len(best)), best]
+
+            if progress_callback:
+                progress_callback(end / total)
+
+        return unique_labels[codes], unique_confidences[codes]
+
+
+def label_names(labels: np.ndarray) -> np.ndarray:
+    """Map numeric labels to their display names."""
+    return np.where(np.asarray(labels) == 1, LABEL_NAMES[1], LABEL_NAMES[0])
@@ -0,0 +1,123 @@
+"""
+Prediction Cache Module
+Bounded LRU/TTL cache of class probabilities keyed on normalized headline text.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from inference import MODEL_DIR
+
+ARTIFACT_FILES = ('model.pkl', 'tfidf.pkl', 'compact/meta.json', 'compact/vocab.npy',
+                  'compact/idf.npy', 'compact/coef.npy')
+
+
+def model_fingerprint(model_dir: str = MODEL_DIR, files: Iterable[str] = ARTIFACT_FILES) -> str:
+    """
+    Hash the contents of the model artifacts.
+
+    A retrained model produces a different fingerprint, which changes every
+    cache key and so invalidates entries scored by the previous model.
+
+    Args:
+        model_dir: Directory holding the artifacts
+        files: Artifact file names to include
+
+    Returns:
+        Hex digest, or an empty string if no artifact exists
+    """
+    digest = hashlib.sha256()
+    found = False
+    for name in files:
+        path = os.path.join(model_dir, name)
+        if not os.path.exists(path):
+            continue
+        found = True
+        digest.update(name.encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest() if found else ''
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = 100000, ttl: Optional[float] = 3600.0, fingerprint: str = ''):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid, or None to never expire
+            fingerprint: Model fingerprint mixed into every key
+        """
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, headline_clean: str) -> bytes:
+        data = f"{self.fingerprint}\0{headline_clean}".encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, headline_clean: str) -> Optional[np.ndarray]:
+        """
+        Look up probabilities for an already normalized headline.
+
+        Returns:
+            Cached probability row, or None on a miss or expired entry
+        """
+        key = self._key(headline_clean)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, proba = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return proba
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, headline_clean: str, proba: np.ndarray):
+        """Store probabilities for an already normalized headline."""
+        key = self._key(headline_clean)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, proba)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
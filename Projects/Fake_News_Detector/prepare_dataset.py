@@ -1,15 +1,21 @@
-import pandas as pd
+"""
+Dataset Preparation Module
+Loads labeled headlines from a CSV or the built-in sample data.
+
+Importing this module has no side effects; training lives in train_model.py.
+Running it as a script trains with the default settings for backwards
+compatibility.
+"""
+
+from typing import Optional
+
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
-import pickle
-import os
+import pandas as pd
+
+from csv_stream import detect_text_column
 
 # Create sample dataset (in production, use real fake news dataset)
 # You can download from: https://www.kaggle.com/datasets/clmentbisaillon/fake-and-real-news-dataset
-np.random.seed(42)
 
 # Sample data for demonstration
 real_headlines = [
@@ -38,60 +44,50 @@ fake_headlines = [
     "Celebrity dies in secret accident"
 ]
 
-# Create DataFrame
-data = pd.DataFrame({
-    'text': real_headlines + fake_headlines,
-    'label': [1] * len(real_headlines) + [0] * len(fake_headlines)
-})
-
-print(f"Dataset shape: {data.shape}")
-print(f"Real news: {(data['label'] == 1).sum()}")
-print(f"Fake news: {(data['label'] == 0).sum()}")
-
-# Clean text
-data['text'] = data['text'].str.lower().str.strip()
-
-# Split data
-X_train, X_test, y_train, y_test = train_test_split(
-    data['text'], data['label'], test_size=0.2, random_state=42, stratify=data['label']
-)
-
-print(f"\nTraining set size: {len(X_train)}")
-print(f"Test set size: {len(X_test)}")
-
-# TF-IDF Vectorization
-tfidf = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
-X_train_tfidf = tfidf.fit_transform(X_train)
-X_test_tfidf = tfidf.transform(X_test)
-
-print(f"TF-IDF features: {X_train_tfidf.shape[1]}")
-
-# Train Logistic Regression model
-model = LogisticRegression(max_iter=1000, random_state=42)
-model.fit(X_train_tfidf, y_train)
-
-# Evaluate
-y_pred = model.predict(X_test_tfidf)
-y_pred_proba = model.predict_proba(X_test_tfidf)
-
-accuracy = accuracy_score(y_test, y_pred)
-precision = precision_score(y_test, y_pred)
-recall = recall_score(y_test, y_pred)
-f1 = f1_score(y_test, y_pred)
-
-print(f"\n=== Model Performance ===")
-print(f"Accuracy: {accuracy:.4f}")
-print(f"Precision: {precision:.4f}")
-print(f"Recall: {recall:.4f}")
-print(f"F1-Score: {f1:.4f}")
-print(f"\nConfusion Matrix:\n{confusion_matrix(y_test, y_pred)}")
-
-# Save model and vectorizer
-os.makedirs('models', exist_ok=True)
-with open('models/model.pkl', 'wb') as f:
-    pickle.dump(model, f)
-
-with open('models/tfidf.pkl', 'wb') as f:
-    pickle.dump(tfidf, f)
 
-print("\n✓ Model and vectorizer saved successfully!")
+def load_sample_dataset() -> pd.DataFrame:
+    """Build the small demonstration dataset."""
+    return pd.DataFrame({
+        'text': real_headlines + fake_headlines,
+        'label': [1] * len(real_headlines) + [0] * len(fake_headlines)
+    })
+
+
+def load_dataset(path: Optional[str] = None, label_column: str = 'label') -> pd.DataFrame:
+    """
+    Load labeled headlines with cleaned text.
+
+    Args:
+        path: CSV with a headline/text/title/news column and a 0/1 label
+              column, or None for the sample data
+        label_column: Name of the label column in the CSV
+
+    Returns:
+        DataFrame with 'text' and 'label' columns
+
+    Raises:
+        ValueError: If the CSV lacks a text or label column
+    """
+    if path is None:
+        data = load_sample_dataset()
+    else:
+        raw = pd.read_csv(path)
+        text_column = detect_text_column(raw.columns)
+        if text_column is None or label_column not in raw.columns:
+            raise ValueError(
+                f"{path}: needs a headline/text/title/news column and a '{label_column}' column"
+            )
+        raw = raw.dropna(subset=[text_column, label_column])
+        data = pd.DataFrame({
+            'text': raw[text_column].astype(str),
+            'label': raw[label_column].to_numpy(dtype=np.int64),
+        })
+
+    # Clean text
+    data['text'] = data['text'].str.lower().str.strip()
+    return data.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from train_model import main
+    main()
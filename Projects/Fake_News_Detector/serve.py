@@ -0,0 +1,275 @@
+"""
+Headless Scoring Server
+Serves fake-news predictions over HTTP/JSON without the Streamlit UI.
+
+The model is loaded once per worker process. Concurrent requests that arrive
+within a short window are merged into a single predict_proba call.
+
+Endpoints:
+    POST /predict        {"headline": "..."}
+    POST /predict/batch  {"headlines": ["...", "..."]}
+    GET  /health         (includes prediction cache hit/miss counters)
+
+Usage:
+    python serve.py --port 8000 --workers 4 --batch-window-ms 2
+"""
+
+import argparse
+import json
+import multiprocessing
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import numpy as np
+
+from inference import LABEL_NAMES, MODEL_DIR, BatchPredictor, load_artifacts
+from prediction_cache import PredictionCache, model_fingerprint
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into one predict_proba call."""
+
+    def __init__(self, predictor: BatchPredictor, window_ms: float = 2.0, max_batch: int = 512):
+        """
+        Initialize the batcher and start its worker thread.
+
+        Args:
+            predictor: Predictor used to score merged batches
+            window_ms: How long to wait for more requests after the first one arrives
+            max_batch: Flush as soon as this many headlines are pending
+        """
+        self.predictor = predictor
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.batches_scored = 0
+        self.rows_scored = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, headlines: List[str]) -> Future:
+        """
+        Queue headlines for scoring.
+
+        Args:
+            headlines: Headlines belonging to one request
+
+        Returns:
+            Future resolving to an array of class probabilities, one row per headline
+        """
+        future = Future()
+        self._queue.put((headlines, future))
+        return future
+
+    def _collect(self):
+        """
+        Block for the first request, then gather more until the window closes.
+
+        A lone request is flushed immediately so an idle server adds no
+        batching delay; the window only applies once requests are queuing up.
+        """
+        pending = [self._queue.get()]
+        size = len(pending[0][0])
+        if self._queue.empty():
+            return pending
+        deadline = time.perf_counter() + self.window
+
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += len(item[0])
+
+        return pending
+
+    def _run(self):
+        """Score merged batches and hand each request its slice of the result."""
+        while True:
+            pending = self._collect()
+            headlines = [h for request, _ in pending for h in request]
+            try:
+                proba = self.predictor.predict_proba(headlines)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self.batches_scored += 1
+            self.rows_scored += len(headlines)
+            offset = 0
+            for request, future in pending:
+                future.set_result(proba[offset:offset + len(request)])
+                offset += len(request)
+
+
+def format_prediction(classes: np.ndarray, proba_row: np.ndarray) -> dict:
+    """Build the JSON payload for one scored headline."""
+    best = int(proba_row.argmax())
+    label = int(classes[best])
+    return {
+        "prediction": label,
+        "label": LABEL_NAMES.get(label, str(label)),
+        "confidence": float(proba_row[best]),
+        "probabilities": {
+            LABEL_NAMES.get(int(c), str(c)): float(p) for c, p in zip(classes, proba_row)
+        },
+    }
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """JSON request handler; the batcher is attached to the server instance."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging; it dominates latency at this scale."""
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0 or length > MAX_BODY_BYTES:
+            raise ValueError("Request body missing or too large")
+        return json.loads(self.rfile.read(length))
+
+    def do_GET(self):
+        if self.path == "/health":
+            batcher = self.server.batcher
+            cache = batcher.predictor.cache
+            self._send_json(200, {
+                "status": "ok",
+                "batches_scored": batcher.batches_scored,
+                "rows_scored": batcher.rows_scored,
+                "cache": cache.stats() if cache is not None else None,
+            })
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path not in ("/predict", "/predict/batch"):
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            payload = self._read_json()
+            if self.path == "/predict":
+                headlines = [payload["headline"]]
+            else:
+                headlines = payload["headlines"]
+                if not isinstance(headlines, list):
+                    raise ValueError("'headlines' must be a list")
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        try:
+            proba = self.server.batcher.submit(headlines).result()
+        except Exception as e:
+            self._send_json(500, {"error": f"Prediction failed: {e}"})
+            return
+
+        classes = self.server.batcher.predictor.model.classes_
+        results = [format_prediction(classes, row) for row in proba]
+        if self.path == "/predict":
+            self._send_json(200, results[0])
+        else:
+            self._send_json(200, {"results": results})
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """Threaded HTTP server that can share its port with sibling worker processes."""
+
+    daemon_threads = True
+
+    def __init__(self, address, batcher: MicroBatcher, reuse_port: bool = False):
+        self.batcher = batcher
+        self.reuse_port = reuse_port
+        super().__init__(address, PredictionHandler)
+
+    def server_bind(self):
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def run_worker(host: str, port: int, model_dir: str, window_ms: float, max_batch: int,
+               reuse_port: bool, cache_size: int = 0, cache_ttl: float = 3600.0):
+    """Load the model once and serve requests until interrupted."""
+    model, tfidf = load_artifacts(model_dir)
+    cache = None
+    if cache_size > 0:
+        cache = PredictionCache(cache_size, ttl=cache_ttl or None,
+                                fingerprint=model_fingerprint(model_dir))
+    predictor = BatchPredictor(model, tfidf, cache=cache)
+    batcher = MicroBatcher(predictor, window_ms=window_ms, max_batch=max_batch)
+    server = ScoringServer((host, port), batcher, reuse_port=reuse_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake news predictions over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes sharing the port (requires SO_REUSEPORT)")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--cache-size", type=int, default=100000,
+                        help="Prediction cache entries per worker (0 disables caching)")
+    parser.add_argument("--cache-ttl", type=float, default=3600.0,
+                        help="Seconds a cached prediction stays valid (0 never expires)")
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        print("SO_REUSEPORT is not available on this platform; running a single worker")
+        workers = 1
+
+    worker_args = (args.host, args.port, args.model_dir, args.batch_window_ms,
+                   args.max_batch, workers > 1, args.cache_size, args.cache_ttl)
+    print(f"Serving on http://{args.host}:{args.port} with {workers} worker(s)")
+
+    if workers == 1:
+        run_worker(*worker_args)
+        return
+
+    processes = [multiprocessing.Process(target=run_worker, args=worker_args)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
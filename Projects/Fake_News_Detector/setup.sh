@@ -11,12 +11,7 @@ pip install -r requirements.txt
 
 # Prepare dataset and train model
 echo "🤖 Training model..."
-python -c "
-import sys
-sys.path.insert(0, '.')
-from scripts.prepare_dataset import *
-print('✓ Dataset prepared and model trained!')
-"
+python train_model.py
 
 echo ""
 echo "✅ Setup complete!"
@@ -0,0 +1,256 @@
+"""
+Out-of-Core Training Module
+Trains the detector on corpora too large for memory by streaming CSV batches
+through a stateless hashing vectorizer into an SGD logistic regression.
+
+The model is saved to the same models/model.pkl and models/tfidf.pkl paths the
+app already loads, and can later be updated with new labeled batches without
+a full refit.
+
+Usage:
+    # Labeled CSV(s) with a text column and a 0/1 'label' column
+    python streaming_training.py corpus.csv --epochs 3
+
+    # Kaggle fake/real layout: one file per class
+    python streaming_training.py --real True.csv --fake Fake.csv
+
+    # Fold new labeled data into the existing model
+    python streaming_training.py new_batch.csv --update
+"""
+
+import argparse
+import hashlib
+import itertools
+import os
+import pickle
+import shutil
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+from compact_model import COMPACT_DIR
+from csv_stream import detect_text_column, read_columns
+from inference import MODEL_DIR, normalize_headline
+
+CLASSES = np.array([0, 1])
+DEFAULT_BATCH_ROWS = 20000
+
+
+def make_vectorizer(n_features: int = 2 ** 20) -> HashingVectorizer:
+    """Build the stateless feature stage; it needs no fitting and never grows."""
+    return HashingVectorizer(
+        n_features=n_features,
+        stop_words='english',
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm='l2',
+    )
+
+
+def make_model(alpha: float = 1e-5, random_state: int = 42) -> SGDClassifier:
+    """Build a logistic-loss linear model that supports partial_fit and predict_proba."""
+    return SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)
+
+
+def is_holdout(text: str, holdout_percent: int) -> bool:
+    """Deterministically assign a row to the holdout set by hashing its text."""
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=2).digest()
+    return int.from_bytes(digest, 'big') % 100 < holdout_percent
+
+
+def _read_source(path: str, label: Optional[int], label_column: str,
+                 batch_rows: int) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """Yield (texts, labels) batches from one CSV, loading only the needed columns."""
+    text_column = detect_text_column(read_columns(path))
+    if text_column is None:
+        raise ValueError(f"{path}: no headline/text/title/news column found")
+    columns = [text_column] if label is not None else [text_column, label_column]
+
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=batch_rows):
+        chunk = chunk.dropna()
+        texts = [normalize_headline(t) for t in chunk[text_column]]
+        if label is not None:
+            labels = np.full(len(texts), label, dtype=np.int64)
+        else:
+            labels = chunk[label_column].to_numpy(dtype=np.int64)
+        yield texts, labels
+
+
+def iter_batches(sources: List[Tuple[str, Optional[int]]], label_column: str = 'label',
+                 batch_rows: int = DEFAULT_BATCH_ROWS) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    Interleave batches from several CSV sources round-robin.
+
+    Interleaving keeps single-class files (the Kaggle layout) from feeding the
+    SGD model long runs of one label.
+
+    Args:
+        sources: (path, label) pairs; label None reads labels from label_column
+        label_column: Column holding 0/1 labels for mixed files
+        batch_rows: Rows read per batch from each source
+    """
+    readers = [_read_source(path, label, label_column, batch_rows) for path, label in sources]
+    for group in itertools.zip_longest(*readers):
+        for batch in group:
+            if batch is not None:
+                yield batch
+
+
+def train_streaming(sources: List[Tuple[str, Optional[int]]], epochs: int = 3,
+                    batch_rows: int = DEFAULT_BATCH_ROWS, holdout_percent: int = 20,
+                    label_column: str = 'label', model=None, vectorizer=None,
+                    random_state: int = 42) -> dict:
+    """
+    Train (or continue training) a model with partial_fit over streamed batches.
+
+    Args:
+        sources: (path, label) pairs, see iter_batches
+        epochs: Full passes over the training rows
+        batch_rows: Rows per batch
+        holdout_percent: Percentage of rows (by text hash) kept for evaluation
+        label_column: Column holding 0/1 labels for mixed files
+        model: Existing SGD model to update, or None to start fresh
+        vectorizer: Existing hashing vectorizer, or None to create one
+        random_state: Seed for the model and batch shuffling
+
+    Returns:
+        Dict with the model, vectorizer, row counts, timing and holdout metrics
+    """
+    vectorizer = vectorizer or make_vectorizer()
+    model = model or make_model(random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    train_rows = 0
+    start = time.perf_counter()
+
+    for epoch in range(epochs):
+        epoch_rows = 0
+        for texts, labels in iter_batches(sources, label_column, batch_rows):
+            mask = np.array([not is_holdout(t, holdout_percent) for t in texts], dtype=bool)
+            if not mask.any():
+                continue
+            X = vectorizer.transform([t for t, keep in zip(texts, mask) if keep])
+            y = labels[mask]
+            order = rng.permutation(len(y))
+            model.partial_fit(X[order], y[order], classes=CLASSES)
+            epoch_rows += len(y)
+        train_rows = epoch_rows
+        print(f"Epoch {epoch + 1}/{epochs}: {epoch_rows:,} rows "
+              f"({time.perf_counter() - start:.1f}s elapsed)")
+
+    fit_time = time.perf_counter() - start
+    if not hasattr(model, 'coef_'):
+        raise ValueError("No training rows found in the given sources")
+
+    # Stream the holdout rows once for evaluation
+    y_true = []
+    y_pred = []
+    for texts, labels in iter_batches(sources, label_column, batch_rows):
+        mask = np.array([is_holdout(t, holdout_percent) for t in texts], dtype=bool)
+        if mask.any():
+            X = vectorizer.transform([t for t, keep in zip(texts, mask) if keep])
+            y_true.append(labels[mask])
+            y_pred.append(model.predict(X))
+
+    metrics = {}
+    if y_true:
+        y_true = np.concatenate(y_true)
+        y_pred = np.concatenate(y_pred)
+        metrics = {
+            'accuracy': accuracy_score(y_true, y_pred),
+            'precision': precision_score(y_true, y_pred, zero_division=0),
+            'recall': recall_score(y_true, y_pred, zero_division=0),
+            'f1': f1_score(y_true, y_pred, zero_division=0),
+            'test_rows': int(len(y_true)),
+        }
+
+    return {
+        'model': model,
+        'vectorizer': vectorizer,
+        'train_rows': train_rows,
+        'fit_time': fit_time,
+        'metrics': metrics,
+    }
+
+
+def save_streaming_artifacts(model, vectorizer, model_dir: str = MODEL_DIR):
+    """
+    Write the artifacts the app loads and remove any stale compact export.
+
+    The compact format stores an explicit vocabulary, which a hashing
+    vectorizer does not have, so an old export would otherwise shadow the
+    freshly trained pickles.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    with open(os.path.join(model_dir, 'model.pkl'), 'wb') as f:
+        pickle.dump(model, f)
+    with open(os.path.join(model_dir, 'tfidf.pkl'), 'wb') as f:
+        pickle.dump(vectorizer, f)
+
+    compact_path = os.path.join(model_dir, COMPACT_DIR)
+    if os.path.isdir(compact_path):
+        shutil.rmtree(compact_path)
+        print(f"Removed stale compact export at {compact_path}")
+
+
+def load_streaming_artifacts(model_dir: str = MODEL_DIR):
+    """
+    Load an existing hashed model for incremental updates.
+
+    Raises:
+        ValueError: If the saved artifacts were not produced by streaming training
+    """
+    with open(os.path.join(model_dir, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join(model_dir, 'tfidf.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+    if not isinstance(vectorizer, HashingVectorizer) or not hasattr(model, 'partial_fit'):
+        raise ValueError("Saved model was not trained in streaming mode; train without --update first")
+    return model, vectorizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the detector out of core with partial_fit")
+    parser.add_argument("corpus", nargs='*', help="CSV files with a text column and a 0/1 label column")
+    parser.add_argument("--real", action='append', default=[], help="CSV of real headlines (label 1)")
+    parser.add_argument("--fake", action='append', default=[], help="CSV of fake headlines (label 0)")
+    parser.add_argument("--label-column", default='label')
+    parser.add_argument("--epochs", type=int, default=None,
+                        help="Passes over the data (default 3, or 1 with --update)")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument("--holdout", type=int, default=20, help="Percent of rows held out for evaluation")
+    parser.add_argument("--update", action='store_true',
+                        help="Continue training the saved streaming model instead of starting fresh")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    args = parser.parse_args()
+
+    sources = ([(path, None) for path in args.corpus]
+               + [(path, 1) for path in args.real]
+               + [(path, 0) for path in args.fake])
+    if not sources:
+        parser.error("Provide at least one corpus CSV or --real/--fake file")
+
+    model = vectorizer = None
+    if args.update:
+        model, vectorizer = load_streaming_artifacts(args.model_dir)
+    epochs = args.epochs or (1 if args.update else 3)
+
+    result = train_streaming(sources, epochs=epochs, batch_rows=args.batch_rows,
+                             holdout_percent=args.holdout, label_column=args.label_column,
+                             model=model, vectorizer=vectorizer)
+    save_streaming_artifacts(result['model'], result['vectorizer'], args.model_dir)
+
+    print("\n=== Model Performance (holdout) ===")
+    for name in ('accuracy', 'precision', 'recall', 'f1'):
+        if name in result['metrics']:
+            print(f"{name.capitalize()}: {result['metrics'][name]:.4f}")
+    print(f"\nTrained on {result['train_rows']:,} rows per epoch in {result['fit_time']:.1f}s")
+    print("✓ Model and vectorizer saved successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Hyperparameter Sweep Module
+Evaluates a grid of vectorizer and model settings in a process pool and
+records quality and speed for each configuration.
+
+Each vectorizer configuration is fitted once and its training matrix is
+cached on disk, so the regularization and solver variants that share it do
+not re-tokenize the corpus.
+
+Usage:
+    python sweep.py --data corpus.csv --workers 4
+    python sweep.py --data corpus.csv --ngrams 1,1 1,2 --max-features 5000 20000 \\
+        --C 0.1 1 10 --solvers liblinear saga --output sweep_results.json
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from prepare_dataset import load_dataset
+
+DEFAULT_NGRAMS = [(1, 1), (1, 2), (1, 3)]
+DEFAULT_MAX_FEATURES = [1000, 5000, 20000]
+DEFAULT_C = [0.1, 1.0, 10.0]
+DEFAULT_SOLVERS = ['liblinear', 'lbfgs', 'saga']
+
+# Populated once per worker process by _init_worker
+_DATA = {}
+
+
+def data_fingerprint(texts: List[str], labels: np.ndarray) -> str:
+    """Hash the dataset so cached vectorizer output is reused only for identical data."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(labels.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def vectorizer_key(data_hash: str, ngram_range: Tuple[int, int], max_features: int) -> str:
+    """Cache key for one vectorizer configuration on one dataset."""
+    return f"{data_hash}-ng{ngram_range[0]}{ngram_range[1]}-mf{max_features}"
+
+
+def _init_worker(train_texts, test_texts, y_train, y_test, cache_dir):
+    _DATA.update(train_texts=train_texts, test_texts=test_texts,
+                 y_train=y_train, y_test=y_test, cache_dir=cache_dir)
+
+
+def _vectorize(key: str, ngram_range: Tuple[int, int], max_features: int) -> dict:
+    """Fit one vectorizer configuration and cache its training matrix (worker process)."""
+    path = os.path.join(_DATA['cache_dir'], key)
+    if os.path.exists(path + '.json'):
+        with open(path + '.json') as f:
+            return dict(json.load(f), key=key, cached=True)
+
+    start = time.perf_counter()
+    tfidf = TfidfVectorizer(max_features=max_features, stop_words='english', ngram_range=ngram_range)
+    X_train = tfidf.fit_transform(_DATA['train_texts'])
+    elapsed = time.perf_counter() - start
+
+    # stop_words_ is only needed for introspection and dominates the pickle size
+    tfidf.stop_words_ = None
+    sparse.save_npz(path + '.train.npz', X_train)
+    with open(path + '.vectorizer.pkl', 'wb') as f:
+        pickle.dump(tfidf, f)
+    # Written last, so its presence marks a complete cache entry
+    with open(path + '.json', 'w') as f:
+        json.dump({'vectorize_time': elapsed}, f)
+    return {'key': key, 'vectorize_time': elapsed, 'cached': False}
+
+
+def _fit_and_score(key: str, config: dict) -> dict:
+    """Fit one model variant on cached features and measure it (worker process)."""
+    path = os.path.join(_DATA['cache_dir'], key)
+    X_train = sparse.load_npz(path + '.train.npz')
+    with open(path + '.vectorizer.pkl', 'rb') as f:
+        tfidf = pickle.load(f)
+
+    model = LogisticRegression(C=config['C'], solver=config['solver'], max_iter=1000, random_state=42)
+    start = time.perf_counter()
+    model.fit(X_train, _DATA['y_train'])
+    fit_time = time.perf_counter() - start
+
+    # End-to-end inference: raw text -> vectorize -> predict_proba
+    test_texts = _DATA['test_texts']
+    start = time.perf_counter()
+    proba = model.predict_proba(tfidf.transform(test_texts))
+    inference_time = time.perf_counter() - start
+    y_pred = model.classes_[proba.argmax(axis=1)]
+
+    y_test = _DATA['y_test']
+    return dict(
+        config,
+        accuracy=accuracy_score(y_test, y_pred),
+        f1=f1_score(y_test, y_pred, zero_division=0),
+        fit_time=fit_time,
+        inference_rows_per_sec=len(test_texts) / inference_time if inference_time else None,
+        model_size_bytes=len(pickle.dumps(model)) + len(pickle.dumps(tfidf)),
+        n_features=int(X_train.shape[1]),
+    )
+
+
+def mark_pareto_frontier(results: List[dict]):
+    """Flag results not beaten on both F1 and inference speed by another result."""
+    for result in results:
+        result['pareto'] = not any(
+            other['f1'] >= result['f1']
+            and other['inference_rows_per_sec'] >= result['inference_rows_per_sec']
+            and (other['f1'] > result['f1']
+                 or other['inference_rows_per_sec'] > result['inference_rows_per_sec'])
+            for other in results
+        )
+
+
+def run_sweep(texts: List[str], labels: np.ndarray, ngram_ranges, max_features_list, c_values,
+              solvers, workers: int = None, cache_dir: str = 'models/sweep_cache') -> List[dict]:
+    """
+    Run the full grid and return one result dict per configuration.
+
+    Args:
+        texts: Normalized headlines
+        labels: 0/1 labels
+        ngram_ranges: (min_n, max_n) tuples to try
+        max_features_list: Vocabulary sizes to try
+        c_values: Inverse regularization strengths to try
+        solvers: LogisticRegression solvers to try
+        workers: Process pool size (defaults to CPU count)
+        cache_dir: Where vectorized matrices are cached between runs
+
+    Returns:
+        List of result dicts sorted by F1 then inference speed
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    train_texts, test_texts, y_train, y_test = train_test_split(
+        texts, labels, test_size=0.2, random_state=42, stratify=labels
+    )
+    data_hash = data_fingerprint(texts, labels)
+    vectorizer_configs = {
+        vectorizer_key(data_hash, ngram, mf): (ngram, mf)
+        for ngram, mf in itertools.product(ngram_ranges, max_features_list)
+    }
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(train_texts, test_texts, y_train, y_test, cache_dir)) as pool:
+        # Stage 1: one vectorizer fit per configuration
+        vectorize_times = {}
+        futures = [pool.submit(_vectorize, key, ngram, mf)
+                   for key, (ngram, mf) in vectorizer_configs.items()]
+        for future in as_completed(futures):
+            info = future.result()
+            vectorize_times[info['key']] = info['vectorize_time']
+            status = "cached" if info['cached'] else f"{info['vectorize_time']:.2f}s"
+            print(f"Vectorized {info['key']} ({status})")
+
+        # Stage 2: every model variant reuses the cached matrices
+        futures = []
+        for key, (ngram, mf) in vectorizer_configs.items():
+            for c, solver in itertools.product(c_values, solvers):
+                config = {'ngram_range': list(ngram), 'max_features': mf, 'C': c, 'solver': solver,
+                          'vectorize_time': vectorize_times[key]}
+                futures.append(pool.submit(_fit_and_score, key, config))
+
+        results = []
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"  ngram={tuple(result['ngram_range'])} max_features={result['max_features']} "
+                  f"C={result['C']} solver={result['solver']}: f1={result['f1']:.4f} "
+                  f"fit={result['fit_time']:.2f}s")
+
+    mark_pareto_frontier(results)
+    results.sort(key=lambda r: (-r['f1'], -r['inference_rows_per_sec']))
+    return results
+
+
+def _parse_ngram(value: str) -> Tuple[int, int]:
+    low, high = value.split(',')
+    return int(low), int(high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep vectorizer/model settings for the detector")
+    parser.add_argument("--data", default=None,
+                        help="CSV with a text column and a 0/1 label column (defaults to the sample data)")
+    parser.add_argument("--label-column", default='label')
+    parser.add_argument("--ngrams", nargs='+', type=_parse_ngram, default=DEFAULT_NGRAMS,
+                        help="N-gram ranges as min,max (e.g. 1,2)")
+    parser.add_argument("--max-features", nargs='+', type=int, default=DEFAULT_MAX_FEATURES)
+    parser.add_argument("--C", nargs='+', type=float, default=DEFAULT_C)
+    parser.add_argument("--solvers", nargs='+', default=DEFAULT_SOLVERS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default='models/sweep_cache')
+    parser.add_argument("--output", default='models/sweep_results.json')
+    args = parser.parse_args()
+
+    data = load_dataset(args.data, args.label_column)
+    texts, labels = data['text'].tolist(), data['label'].to_numpy()
+    start = time.perf_counter()
+    results = run_sweep(texts, labels, args.ngrams, args.max_features, args.C, args.solvers,
+                        workers=args.workers, cache_dir=args.cache_dir)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n=== Speed/Quality Frontier ({len(results)} configs in {elapsed:.1f}s) ===")
+    for r in results:
+        if r['pareto']:
+            print(f"ngram={tuple(r['ngram_range'])} max_features={r['max_features']} C={r['C']} "
+                  f"solver={r['solver']}: f1={r['f1']:.4f} acc={r['accuracy']:.4f} "
+                  f"{r['inference_rows_per_sec']:,.0f} rows/sec {r['model_size_bytes'] / 1024:.0f} KB")
+    print(f"\n✓ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
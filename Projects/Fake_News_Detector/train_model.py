@@ -1,17 +1,209 @@
-import pickle
+"""
+Model Training Pipeline
+Trains, evaluates and saves the detector in explicit, timed stages:
+
+    load -> vectorize -> fit -> evaluate -> persist
+
+The output of each stage is cached on disk under a hash of its inputs, so
+rerunning with the same data and settings (for example to regenerate metrics
+or re-export artifacts) reuses the fitted model instead of training again.
+
+Usage:
+    python train_model.py                         # sample data
+    python train_model.py --data corpus.csv --C 10
+    python train_model.py --no-cache              # force every stage to run
+"""
+
+import argparse
+import hashlib
+import json
 import os
-from scripts.prepare_dataset import (
-    X_train_tfidf, X_test_tfidf, y_train, y_test,
-    model, tfidf, accuracy, precision, recall, f1
-)
-
-# Save metrics
-os.makedirs('models', exist_ok=True)
-metrics_text = f"""
+import pickle
+import time
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+
+from compact_model import COMPACT_DIR, export_compact
+from inference import MODEL_DIR
+from prepare_dataset import load_dataset
+
+STAGE_CACHE_DIR = '.stage_cache'
+
+
+def _hash(*parts) -> str:
+    """Combine JSON-serializable parts into a short hex digest."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+class TrainingPipeline:
+    """Run the training stages with timing and an on-disk cache keyed by input hash."""
+
+    def __init__(self, data_path: str = None, model_dir: str = MODEL_DIR,
+                 max_features: int = 5000, ngram_range=(1, 2), C: float = 1.0,
+                 test_size: float = 0.2, random_state: int = 42, use_cache: bool = True):
+        """
+        Initialize the pipeline.
+
+        Args:
+            data_path: Labeled CSV, or None for the sample data
+            model_dir: Where artifacts, metrics and the stage cache are written
+            max_features: TF-IDF vocabulary size
+            ngram_range: TF-IDF n-gram range
+            C: Inverse regularization strength for LogisticRegression
+            test_size: Fraction of rows held out for evaluation
+            random_state: Seed for the split and the model
+            use_cache: Reuse cached stage outputs when their inputs are unchanged
+        """
+        self.data_path = data_path
+        self.model_dir = model_dir
+        self.vectorizer_params = {
+            'max_features': max_features,
+            'stop_words': 'english',
+            'ngram_range': tuple(ngram_range),
+        }
+        self.model_params = {'C': C, 'max_iter': 1000, 'random_state': random_state}
+        self.split_params = {'test_size': test_size, 'random_state': random_state}
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(model_dir, STAGE_CACHE_DIR)
+        self.timings = {}
+        self.cache_hits = {}
+
+    def _run_stage(self, name: str, key: str, func):
+        """Time a stage and load/store its output in the stage cache."""
+        path = os.path.join(self.cache_dir, f"{name}-{key}.pkl")
+        start = time.perf_counter()
+
+        if self.use_cache and os.path.exists(path):
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            self.cache_hits[name] = True
+        else:
+            result = func()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump(result, f)
+            self.cache_hits[name] = False
+
+        self.timings[name] = time.perf_counter() - start
+        status = "cached" if self.cache_hits[name] else "ran"
+        print(f"[{name}] {status} in {self.timings[name]:.3f}s")
+        return result
+
+    def load(self):
+        """Load the dataset; always runs since its hash keys the later stages."""
+        start = time.perf_counter()
+        data = load_dataset(self.data_path)
+        self.timings['load'] = time.perf_counter() - start
+        data_hash = hashlib.sha256(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+        print(f"[load] {len(data)} rows in {self.timings['load']:.3f}s")
+        print(f"Real news: {(data['label'] == 1).sum()}")
+        print(f"Fake news: {(data['label'] == 0).sum()}")
+        return data, data_hash.hexdigest()[:16]
+
+    def vectorize(self, data, data_key: str):
+        """Split the data and fit the TF-IDF vectorizer on the training part."""
+        def run():
+            X_train, X_test, y_train, y_test = train_test_split(
+                data['text'], data['label'], stratify=data['label'], **self.split_params
+            )
+            tfidf = TfidfVectorizer(**self.vectorizer_params)
+            return {
+                'tfidf': tfidf,
+                'X_train': tfidf.fit_transform(X_train),
+                'X_test': tfidf.transform(X_test),
+                'y_train': y_train.to_numpy(),
+                'y_test': y_test.to_numpy(),
+            }
+
+        key = _hash(data_key, self.split_params, self.vectorizer_params)
+        return self._run_stage('vectorize', key, run), key
+
+    def fit(self, features: dict, vectorize_key: str):
+        """Fit the logistic regression model."""
+        def run():
+            model = LogisticRegression(**self.model_params)
+            model.fit(features['X_train'], features['y_train'])
+            return model
+
+        key = _hash(vectorize_key, self.model_params)
+        return self._run_stage('fit', key, run), key
+
+    def evaluate(self, model, features: dict, fit_key: str) -> dict:
+        """Score the held-out split."""
+        def run():
+            y_test = features['y_test']
+            y_pred = model.predict(features['X_test'])
+            return {
+                'accuracy': accuracy_score(y_test, y_pred),
+                'precision': precision_score(y_test, y_pred, zero_division=0),
+                'recall': recall_score(y_test, y_pred, zero_division=0),
+                'f1': f1_score(y_test, y_pred, zero_division=0),
+                'confusion_matrix': confusion_matrix(y_test, y_pred).tolist(),
+                'train_samples': int(features['X_train'].shape[0]),
+                'test_samples': int(features['X_test'].shape[0]),
+                'n_features': int(features['X_train'].shape[1]),
+            }
+
+        return self._run_stage('evaluate', fit_key, run)
+
+    def persist(self, model, tfidf, metrics: dict):
+        """Write the model artifacts, compact export and metrics files."""
+        start = time.perf_counter()
+        os.makedirs(self.model_dir, exist_ok=True)
+        with open(os.path.join(self.model_dir, 'model.pkl'), 'wb') as f:
+            pickle.dump(model, f)
+        with open(os.path.join(self.model_dir, 'tfidf.pkl'), 'wb') as f:
+            pickle.dump(tfidf, f)
+
+        # Memory-mappable export used by the app and server for fast cold starts
+        export_compact(model, tfidf, os.path.join(self.model_dir, COMPACT_DIR))
+
+        with open(os.path.join(self.model_dir, 'metrics.txt'), 'w') as f:
+            f.write(format_metrics_text(metrics, self.vectorizer_params))
+        self.timings['persist'] = time.perf_counter() - start
+
+        report = {
+            'metrics': metrics,
+            'params': {
+                'vectorizer': dict(self.vectorizer_params,
+                                   ngram_range=list(self.vectorizer_params['ngram_range'])),
+                'model': self.model_params,
+                'split': self.split_params,
+            },
+            'data': self.data_path or 'sample',
+            'timings': self.timings,
+            'cache_hits': self.cache_hits,
+        }
+        with open(os.path.join(self.model_dir, 'metrics.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[persist] ran in {self.timings['persist']:.3f}s")
+        return report
+
+    def run(self) -> dict:
+        """Run every stage and return the structured metrics report."""
+        data, data_key = self.load()
+        features, vectorize_key = self.vectorize(data, data_key)
+        model, fit_key = self.fit(features, vectorize_key)
+        metrics = self.evaluate(model, features, fit_key)
+        return self.persist(model, features['tfidf'], metrics)
+
+
+def format_metrics_text(metrics: dict, vectorizer_params: dict) -> str:
+    """Render the human-readable metrics.txt report."""
+    accuracy = metrics['accuracy']
+    precision = metrics['precision']
+    recall = metrics['recall']
+    f1 = metrics['f1']
+    ngram_range = vectorizer_params['ngram_range']
+    return f"""
 === FAKE NEWS DETECTOR - MODEL METRICS ===
 
 Model: Logistic Regression
-Vectorizer: TF-IDF (max_features=5000, ngram_range=(1,2))
+Vectorizer: TF-IDF (max_features={vectorizer_params['max_features']}, ngram_range=({ngram_range[0]},{ngram_range[1]}))
 
 PERFORMANCE METRICS:
 - Accuracy:  {accuracy:.4f} ({accuracy*100:.2f}%)
@@ -26,13 +218,35 @@ INTERPRETATION:
 - F1-Score: Harmonic mean of precision and recall
 
 DATASET:
-- Training samples: {len(X_train_tfidf)}
-- Test samples: {len(X_test_tfidf)}
-- Total features: {X_train_tfidf.shape[1]}
+- Training samples: {metrics['train_samples']}
+- Test samples: {metrics['test_samples']}
+- Total features: {metrics['n_features']}
 """
 
-with open('models/metrics.txt', 'w') as f:
-    f.write(metrics_text)
 
-print(metrics_text)
-print("✓ Metrics saved to models/metrics.txt")
+def main():
+    parser = argparse.ArgumentParser(description="Train the fake news detector")
+    parser.add_argument("--data", default=None, help="Labeled CSV (defaults to the sample data)")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--max-features", type=int, default=5000)
+    parser.add_argument("--ngram-range", type=int, nargs=2, default=(1, 2), metavar=('MIN', 'MAX'))
+    parser.add_argument("--C", type=float, default=1.0)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--no-cache", action='store_true', help="Ignore cached stage outputs")
+    args = parser.parse_args()
+
+    pipeline = TrainingPipeline(
+        data_path=args.data, model_dir=args.model_dir, max_features=args.max_features,
+        ngram_range=args.ngram_range, C=args.C, test_size=args.test_size,
+        use_cache=not args.no_cache,
+    )
+    report = pipeline.run()
+
+    print(format_metrics_text(report['metrics'], pipeline.vectorizer_params))
+    print(f"Confusion Matrix:\n{report['metrics']['confusion_matrix']}")
+    print(f"\n✓ Model and vectorizer saved to {args.model_dir}/")
+    print(f"✓ Metrics saved to {args.model_dir}/metrics.txt and {args.model_dir}/metrics.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Synthesized Audio Cache Module
+Content-addressed on-disk cache of synthesized TTS chunks with LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf_audiobook", "tts")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+
+class AudioCache:
+    """Store synthesized audio keyed by a hash of the text and voice settings."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache, creating the directory if needed.
+
+        Args:
+            cache_dir: Directory holding cached audio files
+            max_bytes: Size cap; least recently used files are evicted beyond it
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(entry.stat().st_size for entry in os.scandir(cache_dir)
+                                if entry.is_file())
+
+    @staticmethod
+    def make_key(text: str, engine: str, voice: Optional[str], rate: Optional[float],
+                 volume: Optional[float], lang: Optional[str]) -> str:
+        """
+        Build the cache key for one chunk.
+
+        Args:
+            text: Chunk text
+            engine: TTS engine name
+            voice: Voice identifier, if the engine has one
+            rate: Speech rate, if the engine applies one
+            volume: Volume level, if the engine applies one
+            lang: Language code
+
+        Returns:
+            Hex digest identifying the synthesized audio
+        """
+        payload = json.dumps([text, engine, voice, rate, volume, lang], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{ext}")
+
+    def fetch(self, key: str, ext: str, dest: str) -> bool:
+        """
+        Copy a cached chunk to dest if present.
+
+        The file is hard-linked when possible. Conversions get their own
+        reference, so a later eviction cannot remove audio they still need.
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        path = self._path(key, ext)
+        try:
+            os.utime(path)  # mark as recently used
+            try:
+                os.link(path, dest)
+            except OSError:
+                shutil.copyfile(path, dest)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key: str, ext: str, source_file: str):
+        """Add a synthesized chunk to the cache and evict if over the size cap."""
+        path = self._path(key, ext)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(source_file, temp_path)
+            size = os.path.getsize(temp_path)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)  # atomic, so readers never see a partial file
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self._total_bytes += size - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until under the cap (lock held)."""
+        entries = [entry for entry in os.scandir(self.cache_dir)
+                   if entry.is_file() and not entry.name.endswith(".tmp")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._total_bytes -= size
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Delete every cached file and reset the statistics."""
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    os.remove(entry.path)
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current cache size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
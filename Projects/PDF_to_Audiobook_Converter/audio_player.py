@@ -1,11 +1,19 @@
 """
 Audio Playback and Control Module
-Handles playing and exporting audio files.
+Handles playing and exporting audio files, including gapless playback of
+audiobooks split into segments.
 """
 
 import pygame
+import json
 import os
-from typing import Optional
+import math
+from typing import List, Optional
+
+from transcoder import probe_duration
+
+# Width of the time buckets in the seek index
+SEEK_BUCKET_SECONDS = 5.0
 
 
 class AudioPlayer:
@@ -17,6 +25,17 @@ class AudioPlayer:
         self.is_playing = False
         self.is_paused = False
         self.current_file = None
+        
+        # Playlist state: segment files, their start times on the book's
+        # timeline, and a bucket index mapping time -> segment for seeking
+        self.segments: List[str] = []
+        self.segment_offsets: List[float] = []
+        self.total_duration = 0.0
+        self._seek_index: List[int] = []
+        self._segment_index = None  # Segment playing, or None outside playlist mode
+        self._queued_index = None
+        self._segment_start = 0.0  # Book time at which get_pos() was last 0
+        self._last_pos = 0
     
     def play(self, audio_file: str) -> bool:
         """
@@ -38,6 +57,7 @@ class AudioPlayer:
             self.is_playing = True
             self.is_paused = False
             self.current_file = audio_file
+            self._segment_index = None
             return True
         except Exception as e:
             print(f"Error playing audio: {e}")
@@ -93,7 +113,198 @@ class AudioPlayer:
         return pygame.mixer.music.get_busy()
     
     def get_position(self) -> float:
-        """Get current playback position in seconds."""
-        if self.is_playing:
+        """
+        Get current playback position in seconds.
+        
+        In playlist mode this is the position in the whole book, not in the
+        current segment.
+        """
+        if not self.is_playing:
+            return 0.0
+        if self._segment_index is None:
             return pygame.mixer.music.get_pos() / 1000.0
-        return 0.0
+        if pygame.mixer.music.get_busy() or self.is_paused:
+            self._sync_segment()
+        return min(self._segment_start + max(0, self._last_pos) / 1000.0, self.total_duration)
+    
+    def clear_playlist(self):
+        """Stop playback, including a single file, and forget all segments."""
+        if self.is_playing or self._segment_index is not None:
+            self.stop()
+        self.segments = []
+        self.segment_offsets = []
+        self.total_duration = 0.0
+        self._seek_index = []
+        self._segment_index = None
+        self._queued_index = None
+    
+    def append_segment(self, audio_file: str, duration: Optional[float] = None) -> bool:
+        """
+        Add a segment to the end of the playlist.
+        
+        Segments can be appended while the playlist is playing, so a book can
+        start playing as soon as its first shard exists.
+        
+        Args:
+            audio_file: Path to the segment's audio file
+            duration: Segment length in seconds; probed from the file if omitted
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if not os.path.exists(audio_file):
+                print(f"Audio file not found: {audio_file}")
+                return False
+            if duration is None:
+                duration = probe_duration(audio_file)
+            if not duration:
+                print(f"Could not determine the duration of {audio_file}")
+                return False
+        except Exception as e:
+            print(f"Error adding segment: {e}")
+            return False
+        
+        index = len(self.segments)
+        self.segments.append(audio_file)
+        self.segment_offsets.append(self.total_duration)
+        self.total_duration += duration
+        
+        # Every bucket starting inside this segment points at it
+        buckets = math.ceil(self.total_duration / SEEK_BUCKET_SECONDS)
+        self._seek_index.extend([index] * (buckets - len(self._seek_index)))
+        return True
+    
+    def load_manifest(self, manifest_path: str) -> bool:
+        """
+        Replace the playlist with the shards listed in a sharded conversion's manifest.
+        
+        Args:
+            manifest_path: Path to the manifest.json written by ShardedConverter
+            
+        Returns:
+            True if at least one shard was loaded, False otherwise
+        """
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading manifest: {e}")
+            return False
+        
+        self.clear_playlist()
+        base_dir = os.path.dirname(manifest_path)
+        for shard in manifest.get('shards', []):
+            if not self.append_segment(os.path.join(base_dir, shard['file']), shard.get('duration')):
+                return False
+        return bool(self.segments)
+    
+    def segment_at(self, position: float) -> int:
+        """
+        Find the segment playing at a book position.
+        
+        The bucket index gives the segment at the start of the position's
+        bucket; at most a few segments shorter than a bucket lie between that
+        and the answer, so lookups take constant time however long the book is.
+        """
+        if not self.segments:
+            raise IndexError("playlist is empty")
+        position = max(0.0, min(position, self.total_duration))
+        bucket = min(int(position // SEEK_BUCKET_SECONDS), len(self._seek_index) - 1)
+        index = self._seek_index[bucket]
+        while index + 1 < len(self.segments) and self.segment_offsets[index + 1] <= position:
+            index += 1
+        return index
+    
+    def play_playlist(self, position: float = 0.0) -> bool:
+        """
+        Start playing the playlist from a book position in seconds.
+        
+        Whatever was playing or paused before is stopped, so the playlist
+        always starts audibly.
+        """
+        if not self.segments:
+            return False
+        self.stop()
+        return self.seek(position)
+    
+    def seek(self, position: float) -> bool:
+        """
+        Jump to a position in seconds on the playlist's timeline.
+        
+        Args:
+            position: Book position; clamped to the playlist's length
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.segments:
+            return False
+        position = max(0.0, min(position, self.total_duration))
+        index = self.segment_at(position)
+        return self._start_segment(index, position - self.segment_offsets[index])
+    
+    def _start_segment(self, index: int, offset: float) -> bool:
+        """Play segment `index` from `offset` seconds and queue the one after it."""
+        try:
+            pygame.mixer.music.load(self.segments[index])
+            pygame.mixer.music.play(start=offset)
+            if self.is_paused:
+                pygame.mixer.music.pause()
+            self.is_playing = True
+            self.current_file = self.segments[index]
+            self._segment_index = index
+            self._queued_index = None
+            self._segment_start = self.segment_offsets[index] + offset
+            self._last_pos = 0
+            self._queue_next()
+            return True
+        except Exception as e:
+            print(f"Error playing segment: {e}")
+            return False
+    
+    def _sync_segment(self):
+        """
+        Notice when the queued segment has started playing.
+        
+        get_pos() restarts from zero when pygame moves on to a queued file,
+        which is the only signal that the transition happened.
+        """
+        pos = pygame.mixer.music.get_pos()
+        if 0 <= pos < self._last_pos and self._queued_index is not None:
+            self._segment_index = self._queued_index
+            self._queued_index = None
+            self._segment_start = self.segment_offsets[self._segment_index]
+            self.current_file = self.segments[self._segment_index]
+        self._last_pos = pos
+    
+    def _queue_next(self):
+        """Preload the segment after the current one so it starts without a gap."""
+        next_index = self._segment_index + 1
+        if next_index < len(self.segments) and self._queued_index != next_index:
+            pygame.mixer.music.queue(self.segments[next_index])
+            self._queued_index = next_index
+    
+    def update(self):
+        """
+        Advance playlist bookkeeping; call periodically (e.g. from a Tk timer).
+        
+        pygame can only queue one file ahead, so each time playback moves into
+        the queued segment the next one is queued. If playback ran dry because
+        the next segment was appended too late, it restarts from that segment.
+        """
+        if self._segment_index is None or not self.is_playing or self.is_paused:
+            return
+        
+        if not pygame.mixer.music.get_busy():
+            # A queued segment that was never noticed has played out as well
+            last_played = self._segment_index if self._queued_index is None else self._queued_index
+            next_index = last_played + 1
+            if next_index < len(self.segments):
+                self._start_segment(next_index, 0.0)
+            else:
+                self.is_playing = False
+            return
+        
+        self._sync_segment()
+        self._queue_next()
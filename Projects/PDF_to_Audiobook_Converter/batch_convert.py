@@ -0,0 +1,301 @@
+"""
+Batch Conversion Module
+Converts whole directories of PDFs to audio without the GUI, running several
+documents at once in a process pool and skipping outputs that are up to date.
+
+Usage:
+    python batch_convert.py library/ --output audio/ --jobs 4
+    python batch_convert.py "papers/**/*.pdf" --output audio/ --engine gtts
+    python batch_convert.py library/ --output audio/ --sharded --format .opus
+    python batch_convert.py library/sub/*.pdf --output audio/ --root library/
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+from engine_pool import init_worker, worker_engine
+from pdf_extractor import PDFExtractor
+from sharded_converter import MANIFEST_FILE, ShardedConverter, plan_sections
+from transcoder import probe_duration
+from tts_engine import TTSEngine
+
+STATE_FILE = ".batch_state.json"
+
+
+def find_pdfs(patterns: List[str], recursive: bool = False) -> List[str]:
+    """
+    Expand directories and glob patterns into a sorted list of PDF paths.
+
+    Args:
+        patterns: Directories, PDF files or glob patterns (``**`` is supported)
+        recursive: Also search subdirectories of directory arguments
+    """
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '**', '*.pdf') if recursive else os.path.join(pattern, '*.pdf')
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith('.pdf'):
+                found.add(os.path.abspath(path))
+    return sorted(found)
+
+
+def file_hash(path: str, block_size: int = 1024 ** 2) -> str:
+    """Hash a file's content in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def outside_root(pdf_paths: List[str], root: str) -> List[str]:
+    """Return the PDFs that are not inside root, whose layout cannot be mirrored."""
+    root = os.path.abspath(root)
+    return [path for path in pdf_paths
+            if os.path.commonpath([root, os.path.abspath(path)]) != root]
+
+
+def output_path(pdf_path: str, root: str, output_dir: str, extension: str, sharded: bool) -> str:
+    """
+    Where a document's audio goes: a file, or a directory's manifest when sharded.
+
+    The PDF's location relative to root is mirrored under output_dir, so files
+    with the same name in different subdirectories do not collide. root is
+    fixed rather than derived from the inputs, so a PDF maps to the same
+    output however the batch that includes it was selected.
+    """
+    stem = os.path.splitext(os.path.relpath(os.path.abspath(pdf_path), os.path.abspath(root)))[0]
+    if sharded:
+        return os.path.join(output_dir, stem, MANIFEST_FILE)
+    return os.path.join(output_dir, stem + extension)
+
+
+def convert_document(pdf_path: str, output_file: str, settings: dict) -> dict:
+    """
+    Convert one PDF (worker process).
+
+    Returns:
+        Dict with the status, page count, audio duration and elapsed seconds.
+        Errors are captured in the result instead of raised, so one bad file
+        does not stop the batch.
+    """
+    start = time.perf_counter()
+    result = {'pdf': pdf_path, 'output': output_file, 'pages': 0, 'duration': 0.0}
+    extractor = PDFExtractor(pdf_path)
+    try:
+        if not extractor.load_pdf():
+            raise RuntimeError("could not open PDF")
+        result['pages'] = extractor.get_page_count()
+
+        # pyttsx3 workers keep the engine their initializer configured
+        tts_engine = worker_engine()
+        if tts_engine is None or tts_engine.engine_type != settings['engine']:
+            tts_engine = TTSEngine(engine_type=settings['engine'])
+            tts_engine.set_speed(settings['speed'])
+            tts_engine.set_volume(settings['volume'])
+
+        if settings['sharded']:
+            sections = plan_sections(extractor, settings['by'], settings['pages_per_shard'])
+            converter = ShardedConverter(extractor, tts_engine, os.path.dirname(output_file),
+                                         settings['format'])
+            result['duration'] = converter.convert(sections)['total_duration']
+        else:
+            text = extractor.clean_text() if extractor.extract_text() else ""
+            if not text:
+                raise RuntimeError("no extractable text")
+            os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+            if not tts_engine.convert_to_speech(text, output_file):
+                raise RuntimeError("text-to-speech conversion failed")
+            result['duration'] = probe_duration(output_file) or 0.0
+        result['status'] = 'converted'
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+    finally:
+        extractor.close()
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+class BatchState:
+    """Remember which source and settings produced each output, to skip up-to-date work."""
+
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, STATE_FILE)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def is_up_to_date(self, pdf_path: str, output_file: str, settings_key: str) -> bool:
+        """
+        Check whether output_file was produced from the current PDF and settings.
+
+        The size and mtime are compared first; the content hash is only
+        computed when they changed, so a touched but identical file is skipped.
+        """
+        entry = self.entries.get(pdf_path)
+        if entry is None or entry['settings'] != settings_key or not os.path.exists(output_file):
+            return False
+        stat = os.stat(pdf_path)
+        if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return True
+        if entry['size'] == stat.st_size and entry['sha256'] == file_hash(pdf_path):
+            entry['mtime'] = stat.st_mtime
+            return True
+        return False
+
+    def record(self, pdf_path: str, settings_key: str):
+        stat = os.stat(pdf_path)
+        self.entries[pdf_path] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': file_hash(pdf_path),
+            'settings': settings_key,
+        }
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def run_batch(pdf_paths: List[str], output_dir: str, settings: dict, jobs: int = 2,
+              force: bool = False, root: Optional[str] = None) -> dict:
+    """
+    Convert documents in a process pool of at most `jobs` workers.
+
+    Args:
+        pdf_paths: PDFs to convert
+        output_dir: Directory for audio outputs and the batch state file
+        settings: engine, speed, volume, format, sharded, by, pages_per_shard
+        jobs: Maximum documents converted concurrently
+        force: Convert even if the output is up to date
+        root: Directory whose layout is mirrored under output_dir (default:
+            the current directory); every PDF must be inside it
+
+    Returns:
+        Summary dict with per-document results and throughput figures
+
+    Raises:
+        ValueError: If a PDF is outside root
+    """
+    root = os.path.abspath(root or os.getcwd())
+    outside = outside_root(pdf_paths, root)
+    if outside:
+        raise ValueError(f"{outside[0]} is not inside the root directory {root}")
+    os.makedirs(output_dir, exist_ok=True)
+    state = BatchState(output_dir)
+    settings_key = json.dumps(settings, sort_keys=True)
+    start = time.perf_counter()
+
+    pending = []
+    skipped = []
+    for pdf_path in pdf_paths:
+        output_file = output_path(pdf_path, root, output_dir, settings['format'], settings['sharded'])
+        if not force and state.is_up_to_date(pdf_path, output_file, settings_key):
+            skipped.append(pdf_path)
+        else:
+            pending.append((pdf_path, output_file))
+
+    initializer, initargs = None, ()
+    if settings['engine'] == 'pyttsx3':
+        initializer, initargs = init_worker, (settings['speed'], settings['volume'])
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, jobs), initializer=initializer, initargs=initargs) as pool:
+        futures = [pool.submit(convert_document, pdf_path, output_file, settings)
+                   for pdf_path, output_file in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            name = os.path.basename(result['pdf'])
+            if result['status'] == 'converted':
+                state.record(result['pdf'], settings_key)
+                state.save()
+                print(f"[{len(results)}/{len(pending)}] {name}: {result['pages']} pages, "
+                      f"{result['duration'] / 60:.1f} min audio in {result['elapsed']:.1f}s")
+            else:
+                print(f"[{len(results)}/{len(pending)}] {name}: FAILED ({result['error']})")
+    state.save()
+
+    elapsed = time.perf_counter() - start
+    converted = [r for r in results if r['status'] == 'converted']
+    pages = sum(r['pages'] for r in converted)
+    audio_seconds = sum(r['duration'] for r in converted)
+    return {
+        'results': results,
+        'converted': len(converted),
+        'failed': len(results) - len(converted),
+        'skipped': len(skipped),
+        'pages': pages,
+        'audio_seconds': audio_seconds,
+        'elapsed': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed else 0.0,
+        'audio_hours_per_hour': audio_seconds / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert directories of PDFs to audio in parallel")
+    parser.add_argument("inputs", nargs='+', help="Directories, PDF files or glob patterns")
+    parser.add_argument("--output", required=True, help="Directory for the audio files")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Documents converted concurrently")
+    parser.add_argument("--recursive", action='store_true', help="Search directories recursively")
+    parser.add_argument("--engine", choices=["pyttsx3", "gtts"], default="pyttsx3")
+    parser.add_argument("--format", default=".mp3", choices=[".mp3", ".ogg", ".opus", ".wav"])
+    parser.add_argument("--speed", type=int, default=150, help="Speech speed in WPM")
+    parser.add_argument("--volume", type=float, default=1.0, help="Volume from 0.0 to 1.0")
+    parser.add_argument("--sharded", action='store_true',
+                        help="Write one file per chapter into a directory per document")
+    parser.add_argument("--by", choices=["headings", "pages"], default="headings")
+    parser.add_argument("--pages-per-shard", type=int, default=10)
+    parser.add_argument("--force", action='store_true', help="Reconvert up-to-date outputs")
+    parser.add_argument("--root", default=os.getcwd(),
+                        help="Directory whose layout is mirrored under --output (default: current directory)")
+    args = parser.parse_args()
+    if args.engine == "gtts" and args.format != ".mp3":
+        parser.error("gTTS produces MP3 only; use --format .mp3")
+
+    pdf_paths = find_pdfs(args.inputs, args.recursive)
+    if not pdf_paths:
+        parser.error("No PDF files matched")
+    outside = outside_root(pdf_paths, args.root)
+    if outside:
+        parser.error(f"{outside[0]} is not inside --root {os.path.abspath(args.root)}")
+
+    settings = {
+        'engine': args.engine,
+        'speed': args.speed,
+        'volume': args.volume,
+        'format': args.format,
+        'sharded': args.sharded,
+        'by': args.by,
+        'pages_per_shard': args.pages_per_shard,
+    }
+    print(f"Converting {len(pdf_paths)} PDFs with {args.jobs} workers...")
+    summary = run_batch(pdf_paths, args.output, settings, jobs=args.jobs, force=args.force,
+                        root=args.root)
+
+    print("\n=== Batch Summary ===")
+    print(f"Converted: {summary['converted']}  Skipped (up to date): {summary['skipped']}  "
+          f"Failed: {summary['failed']}")
+    print(f"{summary['pages']:,} pages and {summary['audio_seconds'] / 3600:.2f} hours of audio "
+          f"in {summary['elapsed'] / 60:.1f} min")
+    print(f"Throughput: {summary['pages_per_sec']:.2f} pages/sec, "
+          f"{summary['audio_hours_per_hour']:.1f} audio-hours/hour")
+
+
+if __name__ == "__main__":
+    main()
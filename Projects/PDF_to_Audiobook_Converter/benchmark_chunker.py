@@ -0,0 +1,92 @@
+"""
+Text Chunker Benchmark
+Measures MB/sec of the sentence-aware chunker against the old period-split
+implementation, and checks that time grows linearly with input size.
+
+Usage:
+    python benchmark_chunker.py                  # 5 MB of generated text
+    python benchmark_chunker.py book.txt --max-length 5000
+"""
+
+import argparse
+import time
+
+from text_chunker import iter_text_chunks
+from tts_engine import GTTS_CHUNK_LENGTH
+
+SENTENCES = [
+    "Technology has become an integral part of our daily lives.",
+    "Dr. Smith asked whether cloud computing had changed how businesses store data?",
+    "It has; the effects are visible everywhere, e.g. in healthcare and finance!",
+    "Version 3.2 of the report runs to 40 pages, approx. twice the previous one.",
+]
+
+
+def make_text(size_bytes: int) -> str:
+    """Build roughly size_bytes of sentence-structured text."""
+    paragraph = " ".join(SENTENCES) + "\n"
+    return (paragraph * (size_bytes // len(paragraph) + 1))[:size_bytes]
+
+
+def legacy_split(text: str, max_length: int) -> list:
+    """The previous TTSEngine._split_text, kept for comparison."""
+    chunks = []
+    current_chunk = ""
+    for sentence in text.split('.'):
+        if len(current_chunk) + len(sentence) < max_length:
+            current_chunk += sentence + "."
+        else:
+            if current_chunk:
+                chunks.append(current_chunk)
+            current_chunk = sentence + "."
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+def time_chunker(text: str, max_length: int):
+    """Return (seconds, chunk count, longest chunk, seconds to first chunk)."""
+    start = time.perf_counter()
+    chunks = iter_text_chunks(text, max_length)
+    first_offset, first = next(chunks)
+    first_time = time.perf_counter() - start
+    count, longest = 1, len(first)
+    for _, chunk in chunks:
+        count += 1
+        longest = max(longest, len(chunk))
+    return time.perf_counter() - start, count, longest, first_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TTS text chunker")
+    parser.add_argument("text_file", nargs='?', help="UTF-8 text to chunk (generated if omitted)")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="Size of the generated text")
+    parser.add_argument("--max-length", type=int, default=GTTS_CHUNK_LENGTH)
+    args = parser.parse_args()
+
+    if args.text_file:
+        with open(args.text_file, encoding='utf-8') as f:
+            text = f.read()
+    else:
+        text = make_text(int(args.size_mb * 1024 ** 2))
+    megabytes = len(text.encode('utf-8')) / 1024 ** 2
+
+    elapsed, count, longest, first_time = time_chunker(text, args.max_length)
+    print(f"Chunker: {megabytes:.1f} MB -> {count:,} chunks in {elapsed:.3f}s "
+          f"({megabytes / elapsed:.1f} MB/sec, first chunk after {first_time * 1000:.2f} ms, "
+          f"longest {longest:,} chars)")
+
+    start = time.perf_counter()
+    legacy = legacy_split(text, args.max_length)
+    legacy_elapsed = time.perf_counter() - start
+    print(f"Legacy:  {megabytes:.1f} MB -> {len(legacy):,} chunks in {legacy_elapsed:.3f}s "
+          f"({megabytes / legacy_elapsed:.1f} MB/sec, longest {max(map(len, legacy), default=0):,} chars)")
+
+    # Linear scaling check: a fifth of the input should take about a fifth of the time
+    part = text[:len(text) // 5]
+    part_elapsed = time_chunker(part, args.max_length)[0]
+    print(f"Scaling: 1/5 of the input took {part_elapsed / elapsed:.2f}x the time of the full input")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+TTS Engine Pool Module
+Runs pyttsx3 conversions in a pool of worker processes that each keep one
+pre-initialized engine, so many conversions run at once without paying the
+engine start-up cost per job.
+
+Usage:
+    python engine_pool.py chapter1.txt chapter2.txt --output audio/ --workers 4
+"""
+
+import argparse
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+from audio_cache import AudioCache
+from tts_engine import TTSEngine
+
+# The engine owned by this process when it is a pool worker
+_worker_engine: Optional[TTSEngine] = None
+
+
+def init_worker(speed: int = 150, volume: float = 1.0, use_cache: bool = False):
+    """
+    Pool initializer: create and configure this worker's pyttsx3 engine once.
+
+    Args:
+        speed: Speech speed in WPM
+        volume: Volume from 0.0 to 1.0
+        use_cache: Reuse unchanged chunks from the shared AudioCache
+    """
+    global _worker_engine
+    _worker_engine = TTSEngine(engine_type="pyttsx3", cache=AudioCache() if use_cache else None)
+    _worker_engine.set_speed(speed)
+    _worker_engine.set_volume(volume)
+
+
+def worker_engine() -> Optional[TTSEngine]:
+    """Return the engine of the current pool worker, or None outside a worker."""
+    return _worker_engine
+
+
+def _run_job(text: str, output_file: str) -> dict:
+    """Convert one text with the worker's engine (worker process)."""
+    start = time.perf_counter()
+    success = _worker_engine.convert_to_speech(text, output_file)
+    return {
+        'pid': os.getpid(),
+        'output': output_file,
+        'success': success,
+        'busy': time.perf_counter() - start,
+    }
+
+
+class EnginePool:
+    """Pool of worker processes, each holding one configured pyttsx3 engine."""
+
+    def __init__(self, workers: Optional[int] = None, speed: int = 150, volume: float = 1.0,
+                 use_cache: bool = False):
+        """
+        Start the pool.
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            speed: Speech speed in WPM for every worker
+            volume: Volume from 0.0 to 1.0 for every worker
+            use_cache: Reuse unchanged chunks from the shared AudioCache
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                             initargs=(speed, volume, use_cache))
+        self._lock = threading.Lock()
+        self._busy = {}  # worker pid -> seconds spent converting
+        self._jobs = {}  # worker pid -> jobs finished
+        self._collected = weakref.WeakSet()  # futures whose results were counted
+        self._started = time.perf_counter()
+
+    def submit(self, text: str, output_file: str) -> Future:
+        """
+        Queue a conversion; an idle worker picks it up. Pass the future to
+        collect() to get its result and count it in utilization().
+
+        Returns:
+            Future resolving to a dict with the worker pid, output file,
+            success flag and seconds the worker spent on the job
+        """
+        return self._executor.submit(_run_job, text, output_file)
+
+    def collect(self, future: Future) -> dict:
+        """
+        Wait for a submitted job and return its result.
+
+        The job is counted in utilization() before this returns, so figures
+        read afterwards always include it.
+        """
+        result = future.result()
+        with self._lock:
+            if future not in self._collected:
+                self._collected.add(future)
+                self._busy[result['pid']] = self._busy.get(result['pid'], 0.0) + result['busy']
+                self._jobs[result['pid']] = self._jobs.get(result['pid'], 0) + 1
+        return result
+
+    def convert_all(self, jobs: List[Tuple[str, str]],
+                    progress_callback: Optional[Callable[[int, int, dict], None]] = None) -> List[dict]:
+        """
+        Convert (text, output_file) pairs across the pool.
+
+        Args:
+            jobs: Texts and their output files
+            progress_callback: Called as (done, total, result) as jobs finish
+
+        Returns:
+            Results in the same order as jobs
+        """
+        futures = [self.submit(text, output_file) for text, output_file in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = self.collect(future)
+            if progress_callback:
+                progress_callback(done, len(futures), result)
+        return [future.result() for future in futures]
+
+    def utilization(self) -> dict:
+        """
+        Report how busy each worker has been since the pool started, counting
+        jobs whose results have been collected.
+
+        Returns:
+            Dict mapping worker pid to jobs finished, busy seconds and the
+            busy fraction of the pool's lifetime
+        """
+        elapsed = time.perf_counter() - self._started
+        with self._lock:
+            return {pid: {'jobs': self._jobs[pid],
+                          'busy_seconds': busy,
+                          'utilization': busy / elapsed if elapsed else 0.0}
+                    for pid, busy in self._busy.items()}
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers, waiting for queued jobs unless wait is False."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=exc_type is None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert text files to speech on a pool of pyttsx3 engines")
+    parser.add_argument("text_files", nargs='+')
+    parser.add_argument("--output", required=True, help="Directory for the audio files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--format", default=".mp3", choices=[".mp3", ".ogg", ".opus", ".wav"])
+    parser.add_argument("--speed", type=int, default=150, help="Speech speed in WPM")
+    parser.add_argument("--volume", type=float, default=1.0, help="Volume from 0.0 to 1.0")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    jobs = []
+    for path in args.text_files:
+        with open(path, encoding='utf-8') as f:
+            name = os.path.splitext(os.path.basename(path))[0] + args.format
+            jobs.append((f.read(), os.path.join(args.output, name)))
+
+    def report(done, total, result):
+        status = "ok" if result['success'] else "FAILED"
+        print(f"[{done}/{total}] {os.path.basename(result['output'])}: {status} "
+              f"({result['busy']:.1f}s on worker {result['pid']})")
+
+    start = time.perf_counter()
+    with EnginePool(args.workers, args.speed, args.volume) as pool:
+        results = pool.convert_all(jobs, progress_callback=report)
+        utilization = pool.utilization()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{sum(r['success'] for r in results)}/{len(results)} converted in {elapsed:.1f}s")
+    for pid, stats in sorted(utilization.items()):
+        print(f"  worker {pid}: {stats['jobs']} jobs, {stats['busy_seconds']:.1f}s busy "
+              f"({stats['utilization']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
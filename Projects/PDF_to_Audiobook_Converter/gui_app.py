@@ -8,9 +8,25 @@ from tkinter import filedialog, messagebox, ttk
 import os
 from pathlib import Path
 from pdf_extractor import PDFExtractor
-from tts_engine import TTSEngine
+from page_preview import PagedPreview
+from tts_engine import OUTPUT_FORMATS, TTSEngine
+from audio_cache import AudioCache
 from audio_player import AudioPlayer
+from streaming_playback import StreamingPlayback
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# How often the Tk main loop drains the worker event queue
+EVENT_POLL_MS = 100
+
+# Save dialog labels for the output formats
+OUTPUT_FORMAT_NAMES = {
+    '.mp3': "MP3 files",
+    '.ogg': "Ogg Vorbis files",
+    '.opus': "Opus files",
+    '.wav': "WAV files",
+}
 
 
 class PDFAudiobookConverterGUI:
@@ -25,14 +41,22 @@ class PDFAudiobookConverterGUI:
         
         # Initialize components
         self.pdf_extractor = None
-        self.tts_engine = TTSEngine(engine_type="pyttsx3")
+        self.tts_engine = TTSEngine(engine_type="pyttsx3", cache=AudioCache())
         self.audio_player = AudioPlayer()
-        self.current_text = ""
-        self.conversion_thread = None
+        self.stream = None
+        
+        # Background jobs run one at a time on the executor and report back
+        # through the event queue; only the Tk thread touches widgets
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.events = queue.Queue()
+        self.cancel_event = None
         
         # Create GUI
         self._create_widgets()
         self._setup_styles()
+        
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(EVENT_POLL_MS, self._poll_events)
     
     def _setup_styles(self):
         """Setup custom styles for the GUI."""
@@ -68,13 +92,30 @@ class PDFAudiobookConverterGUI:
         preview_frame = ttk.LabelFrame(main_frame, text="Step 2: Text Preview", padding="10")
         preview_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
-        # Text widget with scrollbar
-        scrollbar = ttk.Scrollbar(preview_frame)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        # Lazily paged preview; only a few pages are loaded at a time
+        self.preview = PagedPreview(preview_frame, on_page_change=self._update_page_label)
+        self.preview.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        self.text_widget = tk.Text(preview_frame, height=8, width=80, yscrollcommand=scrollbar.set)
-        self.text_widget.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.config(command=self.text_widget.yview)
+        # Page range to convert
+        range_frame = ttk.Frame(preview_frame)
+        range_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        
+        self.page_label = ttk.Label(range_frame, text="", style='Normal.TLabel')
+        self.page_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 15))
+        
+        ttk.Label(range_frame, text="Convert pages", style='Normal.TLabel').grid(row=0, column=1)
+        self.start_page_var = tk.IntVar(value=1)
+        self.start_spin = tk.Spinbox(range_frame, from_=1, to=1, width=6, textvariable=self.start_page_var,
+                                     command=lambda: self.preview.go_to_page(self._get_page(self.start_page_var) - 1))
+        self.start_spin.grid(row=0, column=2, padx=5)
+        ttk.Label(range_frame, text="to", style='Normal.TLabel').grid(row=0, column=3)
+        self.end_page_var = tk.IntVar(value=1)
+        self.end_spin = tk.Spinbox(range_frame, from_=1, to=1, width=6, textvariable=self.end_page_var,
+                                   command=lambda: self.preview.go_to_page(self._get_page(self.end_page_var) - 1))
+        self.end_spin.grid(row=0, column=4, padx=5)
+        
+        ttk.Button(range_frame, text="Start here", command=self._set_start_page).grid(row=0, column=5, padx=5)
+        ttk.Button(range_frame, text="End here", command=self._set_end_page).grid(row=0, column=6)
         
         # Conversion Settings Section
         settings_frame = ttk.LabelFrame(main_frame, text="Step 3: Conversion Settings", padding="10")
@@ -109,15 +150,22 @@ class PDFAudiobookConverterGUI:
         conversion_frame = ttk.LabelFrame(main_frame, text="Step 4: Convert & Play", padding="10")
         conversion_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         
-        convert_btn = ttk.Button(conversion_frame, text="Convert to Audio", command=self._convert_to_audio)
-        convert_btn.grid(row=0, column=0, padx=5)
+        self.convert_btn = ttk.Button(conversion_frame, text="Convert to Audio", command=self._convert_to_audio)
+        self.convert_btn.grid(row=0, column=0, padx=5)
         
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(conversion_frame, variable=self.progress_var, maximum=100)
         self.progress_bar.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=5)
         
+        self.cancel_btn = ttk.Button(conversion_frame, text="Cancel", command=self._cancel_job, state=tk.DISABLED)
+        self.cancel_btn.grid(row=0, column=2, padx=5)
+        
+        self.listen_btn = ttk.Button(conversion_frame, text="Listen While Converting",
+                                     command=self._listen_while_converting)
+        self.listen_btn.grid(row=0, column=3, padx=5)
+        
         self.status_label = ttk.Label(conversion_frame, text="Ready", style='Normal.TLabel')
-        self.status_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
+        self.status_label.grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=5)
         
         # Playback Controls Section
         playback_frame = ttk.LabelFrame(main_frame, text="Step 5: Playback Controls", padding="10")
@@ -150,12 +198,18 @@ class PDFAudiobookConverterGUI:
     
     def _browse_pdf(self):
         """Browse and select a PDF file."""
+        if self._job_running():
+            messagebox.showwarning("Warning", "Wait for the current job to finish or cancel it")
+            return
+        
         file_path = filedialog.askopenfilename(
             title="Select PDF File",
             filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
         )
         
         if file_path:
+            if self.pdf_extractor:
+                self.pdf_extractor.close()
             self.pdf_extractor = PDFExtractor(file_path)
             if self.pdf_extractor.load_pdf():
                 self.file_label.config(text=f"File: {os.path.basename(file_path)}")
@@ -164,24 +218,38 @@ class PDFAudiobookConverterGUI:
                 messagebox.showerror("Error", "Failed to load PDF file")
     
     def _extract_and_preview(self):
-        """Extract text from PDF and show preview."""
+        """Show the paged preview and reset the page range to the whole document."""
         if not self.pdf_extractor:
             return
         
-        self.status_label.config(text="Extracting text...")
-        self.root.update()
-        
-        text = self.pdf_extractor.extract_text()
-        cleaned_text = self.pdf_extractor.clean_text()
-        self.current_text = cleaned_text
-        
-        # Show preview
-        preview_text = cleaned_text[:500] + "..." if len(cleaned_text) > 500 else cleaned_text
-        self.text_widget.delete(1.0, tk.END)
-        self.text_widget.insert(1.0, preview_text)
-        
         page_count = self.pdf_extractor.get_page_count()
-        self.status_label.config(text=f"Extracted {page_count} pages. Ready to convert.")
+        self.start_spin.config(to=max(1, page_count))
+        self.end_spin.config(to=max(1, page_count))
+        self.start_page_var.set(1)
+        self.end_page_var.set(max(1, page_count))
+        self.preview.show(self.pdf_extractor)
+        self.status_label.config(text=f"Loaded {page_count} pages. Ready to convert.")
+    
+    def _update_page_label(self, page_num):
+        self.page_label.config(text=f"Viewing page {page_num + 1} of {self.preview.page_count}")
+    
+    def _get_page(self, var) -> int:
+        """Read a page spinbox, clamped to the document."""
+        try:
+            page = var.get()
+        except tk.TclError:
+            page = 1
+        return max(1, min(page, max(1, self.preview.page_count)))
+    
+    def _set_start_page(self):
+        self.start_page_var.set(self.preview.current_page + 1)
+        if self._get_page(self.end_page_var) < self.preview.current_page + 1:
+            self.end_page_var.set(self.preview.current_page + 1)
+    
+    def _set_end_page(self):
+        self.end_page_var.set(self.preview.current_page + 1)
+        if self._get_page(self.start_page_var) > self.preview.current_page + 1:
+            self.start_page_var.set(self.preview.current_page + 1)
     
     def _update_speed(self, value):
         """Update speech speed."""
@@ -197,60 +265,253 @@ class PDFAudiobookConverterGUI:
         percentage = int(volume * 100)
         self.volume_label.config(text=f"{percentage}%")
     
+    def _selected_range(self):
+        """Return the 0-based, end-exclusive page range to convert, or None after warning."""
+        if self._job_running():
+            messagebox.showwarning("Warning", "Wait for the current job to finish or cancel it")
+            return None
+        if not self.pdf_extractor:
+            messagebox.showwarning("Warning", "Please select a PDF first")
+            return None
+        start_page = self._get_page(self.start_page_var)
+        end_page = self._get_page(self.end_page_var)
+        if start_page > end_page:
+            messagebox.showwarning("Warning", "The start page must not be after the end page")
+            return None
+        return start_page - 1, end_page
+    
     def _convert_to_audio(self):
         """Convert PDF text to audio."""
-        if not self.current_text:
-            messagebox.showwarning("Warning", "Please select and extract a PDF first")
+        page_range = self._selected_range()
+        if page_range is None:
             return
         
-        # Ask for output file
+        # Ask for output file, offering only the formats the engine can write
+        engine_type = self.engine_var.get()
         output_file = filedialog.asksaveasfilename(
             defaultextension=".mp3",
-            filetypes=[("MP3 files", "*.mp3"), ("All files", "*.*")]
+            filetypes=[(OUTPUT_FORMAT_NAMES[extension], f"*{extension}")
+                       for extension in OUTPUT_FORMATS[engine_type]]
         )
         
         if not output_file:
             return
         
-        # Run conversion in separate thread
-        self.conversion_thread = threading.Thread(
-            target=self._conversion_worker,
-            args=(output_file,)
-        )
-        self.conversion_thread.start()
+        self._start_job(self._conversion_job, self.pdf_extractor.pdf_path, *page_range,
+                        output_file, engine_type)
     
-    def _conversion_worker(self, output_file):
-        """Worker thread for audio conversion."""
+    def _listen_while_converting(self):
+        """Start playing the selected pages while they are being converted."""
+        page_range = self._selected_range()
+        if page_range is None:
+            return
+        
+        self._close_stream()
+        self.tts_engine.engine_type = self.engine_var.get()
+        self.stream = StreamingPlayback(self.tts_engine, self.audio_player)
+        self._start_job(self._streaming_job, self.pdf_extractor.pdf_path, *page_range, self.stream)
+    
+    def _open_document(self, pdf_path):
+        """
+        Open the job's own copy of the document (worker thread), since PyMuPDF
+        documents must not be shared with the preview on the Tk thread.
+        
+        Returns:
+            The loaded PDFExtractor, or None after posting a failed event
+        """
+        extractor = PDFExtractor(pdf_path)
+        if not extractor.load_pdf():
+            self.events.put(('failed', "Failed to load PDF file"))
+            return None
+        return extractor
+    
+    def _iter_range_text(self, extractor, start_page, end_page, cancel_event):
+        """Yield the cleaned text of each page in the range, posting progress per page; stops when cancelled."""
+        for page_num, page_text in extractor.iter_clean_text("page", start_page, end_page):
+            if cancel_event.is_set():
+                return
+            yield page_text
+            self.events.put(('progress', (page_num + 1 - start_page) / (end_page - start_page) * 100))
+            self.events.put(('status', f"Extracting page {page_num + 1} of {start_page + 1}-{end_page}..."))
+    
+    def _conversion_job(self, pdf_path, start_page, end_page, output_file, engine, cancel_event):
+        """Extract the page range and synthesize it, posting progress per page and chunk (worker thread)."""
+        extractor = self._open_document(pdf_path)
+        if extractor is None:
+            return
         try:
-            self.status_label.config(text="Converting to audio... This may take a while")
-            self.progress_var.set(0)
-            self.root.update()
-            
-            engine = self.engine_var.get()
-            self.tts_engine.engine_type = engine
-            
-            success = self.tts_engine.convert_to_speech(self.current_text, output_file)
-            
-            if success:
-                self.status_label.config(text=f"Conversion complete! Saved to {os.path.basename(output_file)}")
-                self.progress_var.set(100)
-                messagebox.showinfo("Success", f"Audio file saved successfully!\n{output_file}")
-            else:
-                self.status_label.config(text="Conversion failed")
-                messagebox.showerror("Error", "Failed to convert text to audio")
+            text = " ".join(self._iter_range_text(extractor, start_page, end_page, cancel_event))
+        finally:
+            extractor.close()
+        
+        if cancel_event.is_set():
+            self.events.put(('cancelled', "Conversion cancelled"))
+            return
+        if not text:
+            self.events.put(('failed', "No text found in the selected pages"))
+            return
+        
+        def progress(done, total):
+            self.events.put(('progress', done / total * 100))
+            self.events.put(('status', f"Converting to audio... chunk {done}/{total}"))
+        
+        self.events.put(('status', "Converting to audio... This may take a while"))
+        self.tts_engine.engine_type = engine
+        success = self.tts_engine.convert_to_speech(text, output_file, progress, cancel_event)
+        
+        if cancel_event.is_set():
+            self.events.put(('cancelled', "Conversion cancelled"))
+        elif success:
+            self.events.put(('converted', (output_file, self.tts_engine.cache.stats())))
+        else:
+            self.events.put(('failed', "Failed to convert text to audio"))
+    
+    def _streaming_job(self, pdf_path, start_page, end_page, stream, cancel_event):
+        """
+        Feed the page range to the stream page by page (worker thread), so the
+        first chunk is synthesized as soon as its pages have been read.
+        """
+        extractor = self._open_document(pdf_path)
+        if extractor is None:
+            return
+        try:
+            pages = self._iter_range_text(extractor, start_page, end_page, cancel_event)
+            finished = stream.produce(pages, cancel_event)
+        finally:
+            extractor.close()
+        
+        if cancel_event.is_set():
+            self.events.put(('cancelled', "Conversion cancelled"))
+        elif finished and not stream.chunks_synthesized:
+            self.events.put(('failed', "No text found in the selected pages"))
+        elif finished:
+            self.events.put(('synthesized', "Conversion finished; playing the remaining buffered audio"))
+        else:
+            self.events.put(('synthesized', "Streaming stopped"))
+    
+    def _poll_stream(self):
+        """Feed finished chunks to the player and show the stream's metrics (Tk thread)."""
+        if self.stream is None:
+            return
+        if self.stream.poll():
+            metrics = self.stream.metrics()
+            if metrics['time_to_first_audio'] is not None:
+                self.status_label.config(
+                    text=f"Playing {self.audio_player.get_position():.0f}s of "
+                         f"{metrics['produced_seconds']:.0f}s synthesized "
+                         f"(first audio after {metrics['time_to_first_audio']:.1f}s, "
+                         f"{metrics['underruns']} underruns)"
+                )
+            return
+        
+        metrics = self.stream.metrics()
+        self._close_stream()
+        if metrics['time_to_first_audio'] is not None:
+            self.status_label.config(
+                text=f"Finished playing. First audio after {metrics['time_to_first_audio']:.1f}s; "
+                     f"{metrics['underruns']} underruns, {metrics['stall_seconds']:.1f}s waiting for audio"
+            )
+    
+    def _close_stream(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+    
+    def _job_running(self) -> bool:
+        return self.cancel_event is not None
+    
+    def _start_job(self, job, *args):
+        """Run job(*args, cancel_event) on the executor."""
+        self.cancel_event = threading.Event()
+        self.progress_var.set(0)
+        self.convert_btn.config(state=tk.DISABLED)
+        self.listen_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.executor.submit(self._run_job, job, args, self.cancel_event)
+    
+    def _run_job(self, job, args, cancel_event):
+        try:
+            job(*args, cancel_event)
         except Exception as e:
-            self.status_label.config(text="Conversion error")
-            messagebox.showerror("Error", f"Conversion error: {str(e)}")
+            self.events.put(('failed', f"Error: {e}"))
+    
+    def _cancel_job(self):
+        """Ask the running job to stop at its next page or chunk."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.status_label.config(text="Cancelling...")
+    
+    def _poll_events(self):
+        """Apply queued worker events to the widgets (Tk thread)."""
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                self._handle_event(kind, payload)
+        except queue.Empty:
+            pass
+        if self.stream is not None:
+            self._poll_stream()
+        else:
+            self.audio_player.update()
+        self.root.after(EVENT_POLL_MS, self._poll_events)
+    
+    def _handle_event(self, kind, payload):
+        if kind == 'progress':
+            self.progress_var.set(payload)
+        elif kind == 'status':
+            self.status_label.config(text=payload)
+        else:
+            # Every other event ends the job
+            self.cancel_event = None
+            self.convert_btn.config(state=tk.NORMAL)
+            self.listen_btn.config(state=tk.NORMAL)
+            self.cancel_btn.config(state=tk.DISABLED)
+        
+        if kind == 'converted':
+            output_file, stats = payload
+            self.progress_var.set(100)
+            self.status_label.config(
+                text=f"Conversion complete! Saved to {os.path.basename(output_file)} "
+                     f"(cache: {stats['hits']} hits, {stats['misses']} misses)"
+            )
+            messagebox.showinfo("Success", f"Audio file saved successfully!\n{output_file}")
+        elif kind == 'synthesized':
+            self.progress_var.set(100)
+            self.status_label.config(text=payload)
+        elif kind == 'cancelled':
+            self._close_stream()
+            self.progress_var.set(0)
+            self.status_label.config(text=payload)
+        elif kind == 'failed':
+            self._close_stream()
+            self.status_label.config(text=payload)
+            messagebox.showerror("Error", payload)
+    
+    def _on_close(self):
+        """Cancel any running job and close the window."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.executor.shutdown(wait=False)
+        self._close_stream()
+        self.audio_player.stop()
+        self.root.destroy()
     
     def _play_audio(self):
-        """Play the converted audio."""
+        """Play converted audio, or a sharded audiobook from its manifest."""
         audio_file = filedialog.askopenfilename(
             title="Select Audio File",
-            filetypes=[("MP3 files", "*.mp3"), ("WAV files", "*.wav"), ("All files", "*.*")]
+            filetypes=[("Audio files", "*.mp3 *.ogg *.opus *.wav"), ("Audiobook manifest", "*.json"),
+                       ("All files", "*.*")]
         )
         
         if audio_file:
-            if self.audio_player.play(audio_file):
+            self._close_stream()
+            if audio_file.lower().endswith('.json'):
+                playing = self.audio_player.load_manifest(audio_file) and self.audio_player.play_playlist()
+            else:
+                playing = self.audio_player.play(audio_file)
+            if playing:
                 self.status_label.config(text=f"Playing: {os.path.basename(audio_file)}")
             else:
                 messagebox.showerror("Error", "Failed to play audio file")
@@ -271,7 +532,11 @@ class PDFAudiobookConverterGUI:
     
     def _stop_audio(self):
         """Stop audio playback."""
-        if self.audio_player.stop():
+        if self.stream is not None:
+            self._cancel_job()
+            self._close_stream()
+            self.status_label.config(text="Audio stopped")
+        elif self.audio_player.stop():
             self.status_label.config(text="Audio stopped")
         else:
             messagebox.showwarning("Warning", "No audio is currently playing")
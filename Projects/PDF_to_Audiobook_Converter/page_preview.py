@@ -0,0 +1,189 @@
+"""
+Paged Text Preview Module
+Tk text preview of a whole PDF that keeps only a small window of pages loaded.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional, Tuple
+
+from pdf_extractor import PDFExtractor, clean_fragment
+
+DEFAULT_WINDOW_PAGES = 5
+
+# Load the next/previous page when the view is this close to the window's edge
+EDGE_FRACTION = 0.15
+
+
+class PagedPreview(ttk.Frame):
+    """
+    Scrollable preview that loads page text on demand as the user scrolls.
+
+    The scrollbar spans the whole document, but the text widget only ever
+    holds `window_pages` pages, so opening a thousand-page PDF costs the same
+    as opening a short one. Page text is read without being cached.
+    """
+
+    def __init__(self, parent, window_pages: int = DEFAULT_WINDOW_PAGES,
+                 on_page_change: Optional[Callable[[int], None]] = None, **kwargs):
+        """
+        Initialize the preview.
+
+        Args:
+            parent: Parent widget
+            window_pages: Pages kept in the text widget at a time
+            on_page_change: Called with the 0-based page at the top of the view
+        """
+        super().__init__(parent, **kwargs)
+        self.window_pages = max(2, window_pages)
+        self.on_page_change = on_page_change
+        self.extractor = None
+        self.page_count = 0
+        self.current_page = 0
+        self._loaded: List[int] = []
+        self._last_first = 0.0
+        self._shift_pending = False
+
+        self.scrollbar = ttk.Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        self.text = tk.Text(self, height=8, width=80, wrap=tk.WORD, state=tk.DISABLED,
+                            yscrollcommand=self._on_text_scroll)
+        self.text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.text.tag_configure('header', font=('Helvetica', 9, 'bold'), foreground='gray40')
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+    def show(self, extractor: Optional[PDFExtractor]):
+        """Preview a loaded document from its first page, or clear with None."""
+        self.extractor = extractor
+        self.page_count = extractor.get_page_count() if extractor else 0
+        self._load_window(0)
+        self.current_page = 0
+        if self.on_page_change:
+            self.on_page_change(0)
+
+    def go_to_page(self, page_num: int):
+        """Scroll so that page_num is at the top of the view."""
+        if not self.page_count:
+            return
+        page_num = max(0, min(page_num, self.page_count - 1))
+        if page_num not in self._loaded:
+            self._load_window(page_num - self.window_pages // 2)
+        self._restore_anchor((page_num, 0))
+        self._last_first = self.text.yview()[0]
+
+    def _page_content(self, page_num: int) -> str:
+        text = clean_fragment(self.extractor.get_page_text(page_num, cache=False))
+        return text or "(no text on this page)"
+
+    def _insert_page(self, page_num: int, at_start: bool):
+        tag = f"page{page_num}"
+        header = f"— Page {page_num + 1} of {self.page_count} —\n"
+        body = self._page_content(page_num) + "\n\n"
+        if at_start:
+            self.text.insert("1.0", body, (tag,))
+            self.text.insert("1.0", header, ('header', tag))
+        else:
+            self.text.insert(tk.END, header, ('header', tag))
+            self.text.insert(tk.END, body, (tag,))
+
+    def _remove_page(self, page_num: int):
+        ranges = self.text.tag_ranges(f"page{page_num}")
+        if ranges:
+            self.text.delete(ranges[0], ranges[-1])
+
+    def _load_window(self, first_page: int):
+        """Replace the widget content with window_pages pages starting near first_page."""
+        first_page = max(0, min(first_page, self.page_count - self.window_pages))
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self._loaded = list(range(first_page, min(first_page + self.window_pages, self.page_count)))
+        for page_num in self._loaded:
+            self._insert_page(page_num, at_start=False)
+        self.text.config(state=tk.DISABLED)
+        self.text.yview_moveto(0)
+
+    def _top_anchor(self) -> Optional[Tuple[int, int]]:
+        """Return (page, line offset within the page) at the top of the view."""
+        top = self.text.index("@0,0")
+        for tag in self.text.tag_names(top):
+            if tag.startswith("page"):
+                start = str(self.text.tag_ranges(tag)[0])
+                return int(tag[4:]), int(top.split('.')[0]) - int(start.split('.')[0])
+        return None
+
+    def _restore_anchor(self, anchor: Optional[Tuple[int, int]]):
+        """Scroll so the anchor's page and line are back at the top of the view."""
+        if anchor is None:
+            return
+        ranges = self.text.tag_ranges(f"page{anchor[0]}")
+        if ranges:
+            line = int(str(ranges[0]).split('.')[0]) + anchor[1]
+            self.text.yview(f"{line}.0")
+
+    def _set_current_page(self, page_num: int):
+        if page_num != self.current_page:
+            self.current_page = page_num
+            if self.on_page_change:
+                self.on_page_change(page_num)
+
+    def _on_text_scroll(self, first: str, last: str):
+        """Map the window's scroll position onto the whole document for the scrollbar."""
+        first, last = float(first), float(last)
+        if not self._loaded:
+            self.scrollbar.set(0, 1)
+            return
+
+        span = len(self._loaded)
+        self.scrollbar.set((self._loaded[0] + first * span) / self.page_count,
+                           (self._loaded[0] + last * span) / self.page_count)
+
+        anchor = self._top_anchor()
+        if anchor is not None:
+            self._set_current_page(anchor[0])
+        if not self._shift_pending:
+            self._shift_pending = True
+            self.after_idle(self._maybe_shift)
+
+    def _maybe_shift(self):
+        """Slide the window by one page when the view nears its top or bottom."""
+        self._shift_pending = False
+        if not self._loaded:
+            return
+
+        first, last = self.text.yview()
+        moving_down = first >= self._last_first
+        self._last_first = first
+
+        if moving_down and last > 1 - EDGE_FRACTION and self._loaded[-1] < self.page_count - 1:
+            anchor = self._top_anchor()
+            self.text.config(state=tk.NORMAL)
+            self._loaded.append(self._loaded[-1] + 1)
+            self._insert_page(self._loaded[-1], at_start=False)
+            if len(self._loaded) > self.window_pages:
+                self._remove_page(self._loaded.pop(0))
+            self.text.config(state=tk.DISABLED)
+            self._restore_anchor(anchor)
+        elif not moving_down and first < EDGE_FRACTION and self._loaded[0] > 0:
+            anchor = self._top_anchor()
+            self.text.config(state=tk.NORMAL)
+            self._loaded.insert(0, self._loaded[0] - 1)
+            self._insert_page(self._loaded[0], at_start=True)
+            if len(self._loaded) > self.window_pages:
+                self._remove_page(self._loaded.pop())
+            self.text.config(state=tk.DISABLED)
+            self._restore_anchor(anchor)
+        else:
+            return
+        self._last_first = self.text.yview()[0]
+
+    def _on_scrollbar(self, *args):
+        """Scrollbar drags jump to a page anywhere in the document; arrows scroll the text."""
+        if not self.page_count:
+            return
+        if args[0] == 'moveto':
+            self.go_to_page(int(float(args[1]) * self.page_count))
+        else:
+            self.text.yview(*args)
@@ -4,41 +4,117 @@ Handles loading and extracting text from PDF files with cleaning and validation.
 """
 
 import fitz  # PyMuPDF
+import os
 import re
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Below this many pages, process start-up costs more than it saves
+MIN_PAGES_FOR_PARALLEL = 32
+
+# Any run of whitespace and characters outside the kept set (word characters
+# and basic punctuation). Cleaning rewrites each run in a single pass; a lone
+# space before a kept character is already clean and is skipped by the lookahead.
+_CLEAN_RUN = re.compile(r'(?! [\w\-\'"])[^\w.,!?\-:;\'"]+')
+_WHITESPACE = re.compile(r'\s')
+_PUNCTUATION = frozenset('.,!?;:')
+
+
+def clean_fragment(text: str) -> str:
+    """
+    Clean and normalize a piece of text in one pass.
+    
+    Equivalent to collapsing whitespace, dropping special characters, removing
+    spaces before punctuation and collapsing spaces, applied in that order.
+    """
+    def replace(match):
+        end = match.end()
+        if end < len(text) and text[end] in _PUNCTUATION:
+            return ''
+        return ' ' if _WHITESPACE.search(match.group()) else ''
+    
+    return _CLEAN_RUN.sub(replace, text).strip()
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extract raw text for pages [start, end) in a worker process."""
+    with fitz.open(pdf_path) as document:
+        return [document[page_num].get_text() for page_num in range(start, end)]
 
 
 class PDFExtractor:
     """Extract and clean text from PDF files."""
     
-    def __init__(self, pdf_path: str):
-        """Initialize with PDF file path."""
+    def __init__(self, pdf_path: str, workers: int = 1):
+        """
+        Initialize with PDF file path.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            workers: Processes used to extract pages (0 or None uses all CPUs)
+        """
         self.pdf_path = pdf_path
+        self.workers = workers if workers else os.cpu_count() or 1
         self.document = None
         self.text_content = ""
+        self._page_cache: Dict[int, str] = {}
         
     def load_pdf(self) -> bool:
         """Load PDF document."""
         try:
             self.document = fitz.open(self.pdf_path)
+            self._page_cache.clear()
             return True
         except Exception as e:
             print(f"Error loading PDF: {e}")
             return False
     
+    def get_page_text(self, page_num: int, cache: bool = True) -> str:
+        """
+        Get the raw text of one page, extracting it only on first access.
+        
+        Args:
+            page_num: 0-based page number
+            cache: Keep the text for later calls; pass False when browsing
+                   a large document so memory does not grow with each page
+        """
+        if page_num in self._page_cache:
+            return self._page_cache[page_num]
+        text = self.document[page_num].get_text()
+        if cache:
+            self._page_cache[page_num] = text
+        return text
+    
+    def _extract_all_pages(self) -> List[str]:
+        """
+        Extract every page once, in order, and cache the raw text.
+        
+        With more than one worker, page ranges are fanned out to a process
+        pool and each worker opens its own copy of the document.
+        """
+        page_count = len(self.document)
+        missing = [n for n in range(page_count) if n not in self._page_cache]
+        
+        if missing and self.workers > 1 and len(missing) >= MIN_PAGES_FOR_PARALLEL:
+            # Several ranges per worker keeps the pool busy when pages vary in cost
+            step = max(1, -(-page_count // (self.workers * 4)))
+            ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(_extract_page_range, self.pdf_path, start, end)
+                           for start, end in ranges]
+                for (start, _), future in zip(ranges, futures):
+                    for offset, text in enumerate(future.result()):
+                        self._page_cache[start + offset] = text
+        
+        return [self.get_page_text(n) for n in range(page_count)]
+    
     def extract_text(self) -> str:
         """Extract text from all pages."""
         if not self.document:
             return ""
         
-        extracted_text = []
-        for page_num in range(len(self.document)):
-            page = self.document[page_num]
-            text = page.get_text()
-            
-            # Skip empty pages
-            if text.strip():
-                extracted_text.append(text)
+        # Skip empty pages
+        extracted_text = [text for text in self._extract_all_pages() if text.strip()]
         
         self.text_content = "\n".join(extracted_text)
         return self.text_content
@@ -48,33 +124,73 @@ class PDFExtractor:
         if not self.text_content:
             return ""
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', self.text_content)
+        return clean_fragment(self.text_content)
+    
+    def iter_clean_text(self, unit: str = "page", start_page: int = 0,
+                        end_page: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily yield cleaned text page by page or paragraph by paragraph.
         
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\-\:\;\'\"]', '', text)
+        Pages are read one at a time and are not added to the page cache, so
+        memory stays flat and consumers can start on the first page while
+        later ones are still unread.
         
-        # Fix spacing around punctuation
-        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        Args:
+            unit: "page" or "paragraph"
+            start_page: First page to read (0-based)
+            end_page: Page to stop before (defaults to the end of the document)
+            
+        Yields:
+            Tuples of (page_number, cleaned_text), skipping empty pieces
+        """
+        if unit not in ("page", "paragraph"):
+            raise ValueError(f"Unknown unit: {unit}")
+        if not self.document:
+            return
         
-        # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
+        page_count = len(self.document)
+        end_page = page_count if end_page is None else min(end_page, page_count)
+        for page_num in range(max(0, start_page), end_page):
+            if unit == "page":
+                pieces = [self.get_page_text(page_num, cache=False)]
+            else:
+                pieces = self._page_paragraphs(page_num)
+            for piece in pieces:
+                cleaned = clean_fragment(piece)
+                if cleaned:
+                    yield page_num, cleaned
+    
+    def _page_paragraphs(self, page_num: int) -> List[str]:
+        """
+        Get the raw text of each text block on a page.
         
-        return text.strip()
+        PyMuPDF separates blocks with a single newline in plain-text output,
+        so paragraphs are taken from its block layout instead of blank lines.
+        """
+        # Blocks are (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+        return [block[4] for block in self.document[page_num].get_text("blocks")
+                if block[6] == 0]
     
     def get_page_count(self) -> int:
         """Get total number of pages."""
         return len(self.document) if self.document else 0
     
+    def get_toc(self) -> List[Tuple[int, str, int]]:
+        """Get the document outline as (level, title, page_num) with 0-based pages."""
+        if not self.document:
+            return []
+        return [(level, title.strip(), page - 1)
+                for level, title, page in self.document.get_toc(simple=True)
+                if page >= 1]
+    
     def extract_by_pages(self) -> List[str]:
         """Extract text page by page."""
         if not self.document:
             return []
         
         pages_text = []
-        for page_num in range(len(self.document)):
-            page = self.document[page_num]
-            text = page.get_text().strip()
+        for text in self._extract_all_pages():
+            text = text.strip()
             if text:  # Only include non-empty pages
                 pages_text.append(text)
         
@@ -84,3 +200,4 @@ class PDFExtractor:
         """Close the PDF document."""
         if self.document:
             self.document.close()
+        self._page_cache.clear()
@@ -0,0 +1,258 @@
+"""
+Sharded Audiobook Conversion Module
+Converts a PDF into one audio file per chapter or page range, with a JSON and
+M3U manifest. Finished shards are checkpointed, so an interrupted conversion
+resumes where it stopped.
+
+Usage:
+    python sharded_converter.py book.pdf book_audio/ --by headings
+    python sharded_converter.py book.pdf book_audio/ --by pages --pages-per-shard 20 --format .opus
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Callable, List, Optional
+
+from pdf_extractor import PDFExtractor, clean_fragment
+from transcoder import probe_duration
+from tts_engine import TTSEngine
+
+MANIFEST_FILE = "manifest.json"
+CHECKPOINT_FILE = ".checkpoint.json"
+PLAYLIST_FILE = "playlist.m3u"
+DEFAULT_PAGES_PER_SHARD = 10
+
+_UNSAFE_FILENAME = re.compile(r'[^\w\-]+')
+
+
+def plan_sections(extractor: PDFExtractor, by: str = "headings", pages_per_shard: int = DEFAULT_PAGES_PER_SHARD,
+                  toc_level: int = 1) -> List[dict]:
+    """
+    Divide a loaded PDF into sections.
+
+    Args:
+        extractor: PDFExtractor with the document loaded
+        by: "headings" to split on outline entries, or "pages" for fixed page ranges.
+            Documents without an outline fall back to page ranges.
+        pages_per_shard: Pages per section when splitting by pages
+        toc_level: Deepest outline level that starts a new section
+
+    Returns:
+        List of dicts with title, start_page and end_page (0-based, end exclusive)
+    """
+    page_count = extractor.get_page_count()
+    starts = []
+    if by == "headings":
+        for level, title, page_num in extractor.get_toc():
+            if level <= toc_level and page_num < page_count and (not starts or page_num > starts[-1][0]):
+                starts.append((page_num, title))
+        if starts and starts[0][0] > 0:
+            starts.insert(0, (0, "Front Matter"))
+    elif by != "pages":
+        raise ValueError(f"Unknown section mode: {by}")
+
+    if not starts:
+        pages_per_shard = max(1, pages_per_shard)
+        starts = [(page_num, f"Pages {page_num + 1}-{min(page_num + pages_per_shard, page_count)}")
+                  for page_num in range(0, page_count, pages_per_shard)]
+
+    ends = [page_num for page_num, _ in starts[1:]] + [page_count]
+    return [{'title': title, 'start_page': start, 'end_page': end}
+            for (start, title), end in zip(starts, ends)]
+
+
+def _write_atomic(path: str, content: str):
+    """Replace a file's content so readers never see a partial write."""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def shard_filename(index: int, title: str, extension: str) -> str:
+    """Build a sortable, filesystem-safe file name for a shard."""
+    slug = _UNSAFE_FILENAME.sub('_', title).strip('_')[:48] or "section"
+    return f"{index + 1:03d}_{slug}{extension}"
+
+
+class ShardedConverter:
+    """Convert a PDF section by section, checkpointing each finished shard."""
+
+    def __init__(self, extractor: PDFExtractor, tts_engine: TTSEngine, output_dir: str,
+                 extension: str = ".mp3"):
+        """
+        Initialize the converter.
+
+        Args:
+            extractor: PDFExtractor with the document loaded
+            tts_engine: Configured TTSEngine
+            output_dir: Directory for shard files and manifests
+            extension: Audio format of the shards (.mp3, .ogg, .opus or .wav)
+        """
+        self.extractor = extractor
+        self.tts_engine = tts_engine
+        self.output_dir = output_dir
+        self.extension = extension
+        self.manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+        self.playlist_path = os.path.join(output_dir, PLAYLIST_FILE)
+        self.checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+
+    def _section_text(self, section: dict) -> str:
+        pages = (self.extractor.get_page_text(page_num, cache=False)
+                 for page_num in range(section['start_page'], section['end_page']))
+        return clean_fragment("\n".join(pages))
+
+    def _shard_key(self, text: str) -> str:
+        """Hash of everything that determines a shard's audio."""
+        engine = self.tts_engine
+        payload = json.dumps([text, engine.engine_type, engine.current_speed, engine.current_volume,
+                              self.extension], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load_checkpoint(self) -> dict:
+        """Map shard key -> entry for shards finished by earlier runs whose files still exist."""
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                finished = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {key: shard for key, shard in finished.items()
+                if os.path.exists(os.path.join(self.output_dir, shard['file']))}
+
+    def _save_checkpoint(self, finished: dict):
+        _write_atomic(self.checkpoint_path, json.dumps(finished, indent=2, ensure_ascii=False))
+
+    def _write_manifest(self, shards: List[dict], total_sections: int):
+        """Atomically rewrite the JSON manifest and M3U playlist."""
+        position = 0.0
+        for shard in shards:
+            shard['start_time'] = position
+            position += shard['duration'] or 0.0
+
+        manifest = {
+            'source': os.path.abspath(self.extractor.pdf_path),
+            'engine': self.tts_engine.engine_type,
+            'format': self.extension,
+            'complete': len(shards) == total_sections,
+            'total_duration': position,
+            'shards': shards,
+        }
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False))
+
+        lines = ["#EXTM3U"]
+        for shard in shards:
+            lines.append(f"#EXTINF:{round(shard['duration'] or -1)},{shard['title']}")
+            lines.append(shard['file'])
+        _write_atomic(self.playlist_path, "\n".join(lines) + "\n")
+
+    def convert(self, sections: List[dict],
+                progress_callback: Optional[Callable[[int, int, dict], None]] = None) -> dict:
+        """
+        Convert every section, skipping shards already finished with the same
+        text and settings.
+
+        Args:
+            sections: Sections from plan_sections
+            progress_callback: Called as (done, total, shard) after each shard
+
+        Returns:
+            Summary dict with shard counts, total audio duration and elapsed time
+
+        Raises:
+            RuntimeError: If a shard fails; finished shards stay checkpointed
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        finished = self.load_checkpoint()
+        shards = []
+        converted = resumed = 0
+        start = time.perf_counter()
+
+        for index, section in enumerate(sections):
+            text = self._section_text(section)
+            if not text:
+                continue
+            key = self._shard_key(text)
+            filename = shard_filename(index, section['title'], self.extension)
+
+            if key in finished and finished[key]['file'] == filename:
+                shard = finished[key]
+                resumed += 1
+            else:
+                output_file = os.path.join(self.output_dir, filename)
+                if not self.tts_engine.convert_to_speech(text, output_file):
+                    raise RuntimeError(f"Failed to convert section {index + 1}: {section['title']}")
+                shard = {
+                    'key': key,
+                    'file': filename,
+                    'title': section['title'],
+                    'start_page': section['start_page'] + 1,
+                    'end_page': section['end_page'],
+                    'characters': len(text),
+                    'duration': probe_duration(output_file),
+                }
+                converted += 1
+                # The file now holds this text's audio, not whatever an older entry recorded
+                finished = {k: v for k, v in finished.items() if v['file'] != filename}
+                finished[key] = shard
+                self._save_checkpoint(finished)
+
+            shards.append(shard)
+            self._write_manifest(shards, len(sections))
+            if progress_callback:
+                progress_callback(index + 1, len(sections), shard)
+
+        # Sections without text produce no shard; drop shards of text that no longer exists
+        self._write_manifest(shards, len(shards))
+        self._save_checkpoint({shard['key']: shard for shard in shards})
+        return {
+            'shards': len(shards),
+            'converted': converted,
+            'resumed': resumed,
+            'total_duration': sum(shard['duration'] or 0.0 for shard in shards),
+            'elapsed': time.perf_counter() - start,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a PDF into per-chapter audio files")
+    parser.add_argument("pdf")
+    parser.add_argument("output_dir")
+    parser.add_argument("--by", choices=["headings", "pages"], default="headings",
+                        help="Split on outline headings (falls back to pages) or fixed page ranges")
+    parser.add_argument("--pages-per-shard", type=int, default=DEFAULT_PAGES_PER_SHARD)
+    parser.add_argument("--toc-level", type=int, default=1, help="Deepest heading level that starts a shard")
+    parser.add_argument("--engine", choices=["pyttsx3", "gtts"], default="pyttsx3")
+    parser.add_argument("--format", default=".mp3", choices=[".mp3", ".ogg", ".opus", ".wav"])
+    parser.add_argument("--speed", type=int, default=150, help="Speech speed in WPM")
+    args = parser.parse_args()
+    if args.engine == "gtts" and args.format != ".mp3":
+        parser.error("gTTS produces MP3 only; use --format .mp3")
+
+    extractor = PDFExtractor(args.pdf)
+    if not extractor.load_pdf():
+        raise SystemExit(1)
+    tts_engine = TTSEngine(engine_type=args.engine)
+    tts_engine.set_speed(args.speed)
+
+    sections = plan_sections(extractor, args.by, args.pages_per_shard, args.toc_level)
+    converter = ShardedConverter(extractor, tts_engine, args.output_dir, args.format)
+
+    def report(done, total, shard):
+        print(f"[{done}/{total}] {shard['file']} (pages {shard['start_page']}-{shard['end_page']})")
+
+    try:
+        summary = converter.convert(sections, progress_callback=report)
+    finally:
+        extractor.close()
+
+    print(f"\n✓ {summary['shards']} shards ({summary['converted']} converted, {summary['resumed']} resumed), "
+          f"{summary['total_duration'] / 3600:.2f} hours of audio in {summary['elapsed']:.1f}s")
+    print(f"✓ Manifest: {converter.manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
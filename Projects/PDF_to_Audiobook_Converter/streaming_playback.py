@@ -0,0 +1,281 @@
+"""
+Streaming Playback Module
+Plays a document while it is still being converted: each synthesized chunk is
+handed to the AudioPlayer as soon as it exists.
+
+Usage:
+    python streaming_playback.py book.pdf
+    python streaming_playback.py book.pdf --engine gtts --buffer 60
+"""
+
+import argparse
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+
+from audio_player import AudioPlayer
+from pdf_extractor import PDFExtractor
+from text_chunker import iter_text_chunks
+from transcoder import probe_duration
+from tts_engine import ConversionCancelled, TTSEngine
+
+# Seconds of synthesized audio allowed to wait ahead of the playhead
+DEFAULT_BUFFER_SECONDS = 120.0
+
+# The first chunk is kept short so the first audio is ready within seconds
+FIRST_CHUNK_LENGTH = 400
+
+POLL_INTERVAL = 0.1
+
+
+def iter_stream_chunks(pieces: Iterable[str], first_length: int, max_length: int) -> Iterator[str]:
+    """
+    Lazily split a stream of text pieces (such as pages) into chunks of at most
+    max_length characters, the first at most first_length.
+
+    Pieces are joined with spaces. Text is held back only while a chunk could
+    still grow with the next piece, so the first chunk is ready as soon as
+    enough pieces have been read.
+    """
+    if isinstance(pieces, str):
+        pieces = [pieces]
+    buffer = ""
+    limit = first_length
+    for piece in chain(pieces, [None]):
+        finished = piece is None
+        if piece:
+            buffer = f"{buffer} {piece}" if buffer else piece
+        while True:
+            consumed = 0
+            limit_changed = False
+            for offset, chunk in iter_text_chunks(buffer, limit):
+                if not finished and len(buffer) - offset <= limit:
+                    break  # The rest may continue in the next piece
+                yield chunk
+                consumed = offset + len(chunk)
+                if limit != max_length:
+                    # Re-chunk the remainder with the full chunk length
+                    limit = max_length
+                    limit_changed = True
+                    break
+            buffer = buffer[consumed:]
+            if not limit_changed:
+                break
+
+
+class StreamingPlayback:
+    """
+    Producer/consumer pipeline between a TTSEngine and an AudioPlayer.
+
+    `produce()` runs on a worker thread and synthesizes chunks into a hand-off
+    queue, pausing while `buffer_seconds` of audio are waiting ahead of the
+    playhead. `poll()` runs periodically on the thread that owns the player,
+    appends finished chunks to its playlist and records buffer underruns.
+    """
+
+    def __init__(self, tts_engine: TTSEngine, player: AudioPlayer,
+                 buffer_seconds: float = DEFAULT_BUFFER_SECONDS):
+        """
+        Initialize the pipeline.
+
+        Args:
+            tts_engine: Configured TTSEngine
+            player: AudioPlayer to play the chunks; its playlist is replaced
+            buffer_seconds: Audio synthesized ahead of the playhead before the producer waits
+        """
+        self.tts_engine = tts_engine
+        self.player = player
+        self.buffer_seconds = buffer_seconds
+        self.work_dir = tempfile.mkdtemp(prefix="tts_stream_")
+
+        self._ready = queue.Queue()
+        self._condition = threading.Condition()
+        self._produced_seconds = 0.0
+        self._playhead = 0.0
+        self._producer_done = False
+        self._stopped = False
+        self._finished = False
+        self._started_at = time.perf_counter()
+        self._stall_started = None
+        self._resume_index = 0
+
+        self.chunks_synthesized = 0
+        self.time_to_first_audio = None
+        self.underruns = 0
+        self.stall_seconds = 0.0
+
+        self.player.clear_playlist()
+
+    def produce(self, text: Iterable[str], cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Synthesize text chunk by chunk into the hand-off queue (worker thread).
+
+        Args:
+            text: Text to convert, as one string or an iterable of pieces such
+                as pages; pieces are only read as the chunks need them
+            cancel_event: Stops synthesis between chunks when set
+
+        Returns:
+            True if every chunk was synthesized, False if stopped or cancelled
+        """
+        chunks = iter_stream_chunks(text, FIRST_CHUNK_LENGTH, self.tts_engine.chunk_length())
+        try:
+            for index, chunk in enumerate(chunks):
+                with self._condition:
+                    while (not self._stopped and not (cancel_event and cancel_event.is_set())
+                           and self._produced_seconds - self._playhead > self.buffer_seconds):
+                        self._condition.wait(POLL_INTERVAL * 5)
+                    if self._stopped:
+                        return False
+
+                chunk_file = self.tts_engine.synthesize_chunk(
+                    chunk, os.path.join(self.work_dir, f"chunk_{index:05d}"), cancel_event=cancel_event)
+                duration = probe_duration(chunk_file) or 0.0
+                with self._condition:
+                    self._produced_seconds += duration
+                self.chunks_synthesized += 1
+                self._ready.put((chunk_file, duration))
+            return True
+        except ConversionCancelled:
+            return False
+        finally:
+            with self._condition:
+                self._producer_done = True
+                if self._stopped:
+                    shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def poll(self) -> bool:
+        """
+        Hand finished chunks to the player and update the playhead; call
+        periodically from the thread that owns the player.
+
+        Returns:
+            True while the stream is still playing or waiting for audio
+        """
+        if self._stopped or self._finished:
+            return False
+
+        added = False
+        while True:
+            try:
+                chunk_file, duration = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            added = self.player.append_segment(chunk_file, duration) or added
+
+        now = time.perf_counter()
+        if self.time_to_first_audio is None and not added:
+            with self._condition:
+                producer_done = self._producer_done
+            if producer_done and self._ready.empty():
+                # The text produced no audio at all
+                self._finished = True
+                return False
+        if self.time_to_first_audio is None:
+            if added and self.player.play_playlist():
+                self.time_to_first_audio = now - self._started_at
+        elif self._stall_started is not None and added:
+            self.player.seek(self.player.segment_offsets[self._resume_index])
+            self.stall_seconds += now - self._stall_started
+            self._stall_started = None
+
+        self.player.update()
+
+        if (self.time_to_first_audio is not None and self._stall_started is None
+                and not self.player.is_playing):
+            with self._condition:
+                producer_done = self._producer_done
+            if producer_done and self._ready.empty():
+                self._finished = True
+                return False
+            # Playback caught up with synthesis
+            self.underruns += 1
+            self._stall_started = now
+            self._resume_index = len(self.player.segments)
+
+        with self._condition:
+            self._playhead = self.player.get_position() if self.player.is_playing else self._playhead
+            self._condition.notify_all()
+        return True
+
+    def buffered_seconds(self) -> float:
+        """Seconds of synthesized audio ahead of the playhead."""
+        with self._condition:
+            return max(0.0, self._produced_seconds - self._playhead)
+
+    def metrics(self) -> dict:
+        """Time to first audio, underrun count and stall time, and synthesis progress."""
+        stall_seconds = self.stall_seconds
+        if self._stall_started is not None:
+            stall_seconds += time.perf_counter() - self._stall_started
+        return {
+            'time_to_first_audio': self.time_to_first_audio,
+            'underruns': self.underruns,
+            'stall_seconds': stall_seconds,
+            'chunks_synthesized': self.chunks_synthesized,
+            'produced_seconds': self._produced_seconds,
+            'buffered_seconds': self.buffered_seconds(),
+        }
+
+    def close(self):
+        """Stop playback and synthesis and remove the chunk files."""
+        if self.player.is_playing:
+            self.player.stop()
+        self.player.clear_playlist()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            if self._producer_done:
+                shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a PDF while it is being converted to speech")
+    parser.add_argument("pdf")
+    parser.add_argument("--engine", choices=["pyttsx3", "gtts"], default="pyttsx3")
+    parser.add_argument("--speed", type=int, default=150, help="Speech speed in WPM")
+    parser.add_argument("--buffer", type=float, default=DEFAULT_BUFFER_SECONDS,
+                        help="Seconds of audio to synthesize ahead of playback")
+    args = parser.parse_args()
+
+    extractor = PDFExtractor(args.pdf)
+    if not extractor.load_pdf():
+        raise SystemExit(1)
+    pages = (page_text for _, page_text in extractor.iter_clean_text("page"))
+
+    tts_engine = TTSEngine(engine_type=args.engine)
+    tts_engine.set_speed(args.speed)
+    stream = StreamingPlayback(tts_engine, AudioPlayer(), args.buffer)
+    cancel_event = threading.Event()
+    producer = threading.Thread(target=stream.produce, args=(pages, cancel_event), daemon=True)
+    producer.start()
+
+    try:
+        while stream.poll():
+            metrics = stream.metrics()
+            print(f"\rPlaying {stream.player.get_position():7.1f}s  buffered {metrics['buffered_seconds']:6.1f}s  "
+                  f"chunks {metrics['chunks_synthesized']}  underruns {metrics['underruns']}", end='', flush=True)
+            time.sleep(POLL_INTERVAL)
+    except KeyboardInterrupt:
+        cancel_event.set()
+    finally:
+        metrics = stream.metrics()
+        stream.close()
+        producer.join()
+        extractor.close()
+
+    print()
+    if metrics['time_to_first_audio'] is None:
+        print("No text found in the PDF")
+    else:
+        print(f"Time to first audio: {metrics['time_to_first_audio']:.1f}s")
+    print(f"Underruns: {metrics['underruns']} ({metrics['stall_seconds']:.1f}s waiting for audio)")
+
+
+if __name__ == "__main__":
+    main()
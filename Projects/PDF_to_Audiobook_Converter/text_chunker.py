@@ -0,0 +1,112 @@
+"""
+Text Chunker Module
+Splits text into TTS-sized chunks at sentence boundaries in a single pass.
+"""
+
+import re
+from typing import Iterator, Tuple
+
+# Sentence-ending punctuation, optionally followed by closing quotes/brackets,
+# that is followed by whitespace or the end of the text
+_SENTENCE_END = re.compile(r'[.?!;]+["\')\]]*(?=\s|$)')
+_NON_SPACE = re.compile(r'\S')
+
+# Characters before the size limit searched first for a sentence boundary
+_INITIAL_WINDOW = 256
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'vs', 'etc', 'e.g', 'i.e',
+    'fig', 'no', 'vol', 'ch', 'p', 'pp', 'inc', 'ltd', 'co', 'corp', 'approx', 'dept',
+})
+_MAX_ABBREVIATION_LENGTH = max(len(word) for word in ABBREVIATIONS)
+
+
+def _is_abbreviation(text: str, period: int) -> bool:
+    """Check whether the period at index `period` follows an abbreviation or initial."""
+    window_start = max(0, period - _MAX_ABBREVIATION_LENGTH - 1)
+    word_start = max(text.rfind(' ', window_start, period), text.rfind('\n', window_start, period)) + 1
+    if word_start == 0 and window_start > 0:
+        return False  # preceding word is longer than any abbreviation
+    word = text[word_start:period]
+    if len(word) == 1:
+        return word.isalpha() and word.isupper()  # initials such as "J. Smith"
+    return word.lower() in ABBREVIATIONS
+
+
+def _skip_space(text: str, pos: int) -> int:
+    """Return the index of the first non-whitespace character at or after pos."""
+    match = _NON_SPACE.search(text, pos)
+    return match.start() if match else len(text)
+
+
+def _last_sentence_end(text: str, start: int, limit: int) -> int:
+    """
+    Find the end of the last sentence boundary within text[start:limit].
+
+    The compiled pattern scans a tail window ending at limit that doubles in
+    size until a boundary is found, so usually only the last few sentences of
+    the chunk are examined and never more than about twice the chunk.
+
+    Returns:
+        Index just past the boundary (including closing quotes/brackets), or -1
+    """
+    window = _INITIAL_WINDOW
+    checked_from = limit
+    while checked_from > start:
+        window_start = max(start, limit - window)
+        # Search one character past limit so the lookahead sees the real next character;
+        # matches starting at or after checked_from were rejected by a smaller window
+        matches = [match for match in _SENTENCE_END.finditer(text, window_start, limit + 1)
+                   if match.end() <= limit and match.start() < checked_from]
+        for match in reversed(matches):
+            if match.end() - match.start() > 1 or text[match.start()] != '.' \
+                    or not _is_abbreviation(text, match.start()):
+                return match.end()
+        checked_from = window_start
+        window *= 2
+    return -1
+
+
+def _last_word_end(text: str, start: int, limit: int) -> int:
+    """Find the last whitespace within text[start + 1:limit + 1], or -1."""
+    return max(text.rfind(' ', start + 1, limit + 1), text.rfind('\n', start + 1, limit + 1))
+
+
+def iter_text_chunks(text: str, max_length: int) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily split text into chunks of at most max_length characters.
+
+    Each chunk ends at the last sentence boundary (.?!; outside known
+    abbreviations) that fits. A sentence longer than max_length is split at a
+    word boundary, and a single word longer than max_length is cut. Boundaries
+    are found by scanning backwards from the size limit, so the work is linear
+    in the length of the text and chunks are slices of the input.
+
+    Args:
+        text: Text to split
+        max_length: Maximum characters per chunk
+
+    Yields:
+        (offset, chunk) pairs, where offset is the chunk's index in text
+    """
+    if max_length < 1:
+        raise ValueError("max_length must be positive")
+
+    length = len(text)
+    start = _skip_space(text, 0)
+    while start < length:
+        limit = start + max_length
+        if limit >= length:
+            end = length
+        else:
+            end = _last_sentence_end(text, start, limit)
+            if end == -1:
+                end = _last_word_end(text, start, limit)
+            if end == -1:
+                end = limit
+
+        chunk = text[start:end].rstrip()
+        if chunk:
+            yield start, chunk
+        start = _skip_space(text, end)
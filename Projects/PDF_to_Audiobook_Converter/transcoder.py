@@ -0,0 +1,168 @@
+"""
+Audio Transcoder Module
+Streams WAV audio into an ffmpeg encoder process with constant memory use.
+
+Usage:
+    python transcoder.py book.wav book.mp3
+    python transcoder.py book.wav book.opus --bitrate 32k
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import time
+import wave
+from typing import List, Optional
+
+DEFAULT_FRAMES_PER_BLOCK = 65536
+
+# Output extension -> ffmpeg codec arguments
+ENCODERS = {
+    '.mp3': ['-c:a', 'libmp3lame'],
+    '.ogg': ['-c:a', 'libvorbis'],
+    '.opus': ['-c:a', 'libopus', '-f', 'ogg'],
+}
+
+# Default bitrate per extension; speech needs far less than music
+DEFAULT_BITRATES = {
+    '.mp3': '64k',
+    '.ogg': '64k',
+    '.opus': '32k',
+}
+
+_DURATION = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+
+# WAV sample width in bytes -> ffmpeg raw PCM format
+_PCM_FORMATS = {1: 'u8', 2: 's16le', 3: 's24le', 4: 's32le'}
+
+
+def is_supported(output_file: str) -> bool:
+    """Check whether the output file's extension has an encoder."""
+    return os.path.splitext(output_file)[1].lower() in ENCODERS
+
+
+def find_ffmpeg() -> str:
+    """
+    Locate the ffmpeg executable.
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not on PATH
+    """
+    path = shutil.which('ffmpeg')
+    if path is None:
+        raise FileNotFoundError("ffmpeg not found on PATH; install it to encode MP3/OGG/Opus")
+    return path
+
+
+def build_command(ffmpeg: str, params, output_file: str, bitrate: Optional[str] = None) -> List[str]:
+    """Build the ffmpeg command reading raw PCM matching params from stdin."""
+    extension = os.path.splitext(output_file)[1].lower()
+    return [
+        ffmpeg, '-hide_banner', '-nostats', '-loglevel', 'error',
+        '-f', _PCM_FORMATS[params.sampwidth],
+        '-ar', str(params.framerate),
+        '-ac', str(params.nchannels),
+        '-i', 'pipe:0',
+        *ENCODERS[extension],
+        '-b:a', bitrate or DEFAULT_BITRATES[extension],
+        '-y', output_file,
+    ]
+
+
+def probe_duration(audio_file: str) -> Optional[float]:
+    """
+    Get the duration of an audio file in seconds without decoding it.
+
+    WAV files are measured from their header; other formats use the duration
+    ffmpeg reports from the container/bitrate. Returns None if unknown.
+    """
+    if audio_file.lower().endswith('.wav'):
+        with wave.open(audio_file, 'rb') as source:
+            return source.getnframes() / source.getframerate()
+
+    result = subprocess.run([find_ffmpeg(), '-hide_banner', '-i', audio_file],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    match = _DURATION.search(result.stderr.decode(errors='replace'))
+    if match is None:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def transcode_wav(wav_file: str, output_file: str, bitrate: Optional[str] = None,
+                  frames_per_block: int = DEFAULT_FRAMES_PER_BLOCK) -> dict:
+    """
+    Encode a WAV file to MP3, OGG Vorbis or Opus by piping fixed-size blocks
+    of frames to ffmpeg, so memory use does not grow with the audio length.
+
+    Args:
+        wav_file: Source WAV file
+        output_file: Destination; the extension selects the codec
+        bitrate: Target bitrate such as '64k' (defaults per codec)
+        frames_per_block: Frames read and written per pipe write
+
+    Returns:
+        Dict with audio duration, elapsed seconds, realtime factor and output size
+
+    Raises:
+        ValueError: If the output extension or WAV sample width is unsupported
+        RuntimeError: If ffmpeg fails
+    """
+    if not is_supported(output_file):
+        raise ValueError(f"Unsupported output format: {output_file}")
+
+    start = time.perf_counter()
+    with wave.open(wav_file, 'rb') as source:
+        params = source.getparams()
+        if params.sampwidth not in _PCM_FORMATS:
+            raise ValueError(f"Unsupported WAV sample width: {params.sampwidth} bytes")
+
+        command = build_command(find_ffmpeg(), params, output_file, bitrate)
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE)
+        try:
+            while True:
+                frames = source.readframes(frames_per_block)
+                if not frames:
+                    break
+                process.stdin.write(frames)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its error is reported below
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            errors = process.stderr.read()
+            process.wait()
+
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({process.returncode}): {errors.decode(errors='replace').strip()}")
+
+    elapsed = time.perf_counter() - start
+    duration = params.nframes / params.framerate if params.framerate else 0.0
+    return {
+        'duration': duration,
+        'elapsed': elapsed,
+        'realtime_factor': duration / elapsed if elapsed else 0.0,
+        'bytes_out': os.path.getsize(output_file),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a WAV file into an MP3/OGG/Opus encoder")
+    parser.add_argument("wav_file")
+    parser.add_argument("output_file", help="Destination ending in .mp3, .ogg or .opus")
+    parser.add_argument("--bitrate", default=None, help="Target bitrate, e.g. 64k")
+    parser.add_argument("--frames-per-block", type=int, default=DEFAULT_FRAMES_PER_BLOCK)
+    args = parser.parse_args()
+
+    stats = transcode_wav(args.wav_file, args.output_file, args.bitrate, args.frames_per_block)
+    print(f"Encoded {stats['duration'] / 60:.1f} min of audio in {stats['elapsed']:.1f}s "
+          f"({stats['realtime_factor']:.0f}x realtime, {stats['bytes_out'] / 1024 ** 2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
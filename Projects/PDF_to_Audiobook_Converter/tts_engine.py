@@ -6,24 +6,69 @@ Handles conversion of text to speech using pyttsx3 and gTTS.
 import pyttsx3
 from gtts import gTTS
 import os
-from typing import Optional
+import shutil
+import tempfile
+import wave
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
 from pathlib import Path
+from audio_cache import AudioCache
+from text_chunker import iter_text_chunks
+from transcoder import ENCODERS, is_supported, transcode_wav
+
+# gTTS has a per-request character limit
+GTTS_CHUNK_LENGTH = 3000
+
+# pyttsx3 has no limit; chunks only exist so unchanged text can be reused from the cache
+PYTTSX3_CHUNK_LENGTH = 5000
+
+# Output extensions each engine can write: pyttsx3 WAV is encoded by ffmpeg,
+# gTTS returns MP3 and is written as is
+OUTPUT_FORMATS = {
+    'pyttsx3': tuple(ENCODERS) + ('.wav',),
+    'gtts': ('.mp3',),
+}
+
+
+class ConversionCancelled(Exception):
+    """Raised inside a conversion when its cancel event is set."""
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ConversionCancelled()
+
+
+def gtts_synthesizer(text: str, output_file: str, lang: str = 'en'):
+    """Synthesize one chunk with the gTTS network backend."""
+    gTTS(text=text, lang=lang, slow=False).save(output_file)
 
 
 class TTSEngine:
     """Convert text to speech with multiple options."""
     
-    def __init__(self, engine_type: str = "pyttsx3"):
+    def __init__(self, engine_type: str = "pyttsx3", synthesizer: Optional[Callable] = None,
+                 max_workers: int = 4, cache: Optional[AudioCache] = None):
         """
         Initialize TTS engine.
         
         Args:
             engine_type: "pyttsx3" for offline or "gtts" for online
+            synthesizer: Chunk synthesizer used by the gTTS path, called as
+                synthesizer(text, output_file, lang); defaults to gTTS. A local
+                stub can be passed to run the pipeline offline.
+            max_workers: Maximum number of chunks synthesized concurrently
+            cache: Optional AudioCache so unchanged chunks are not re-synthesized
         """
         self.engine_type = engine_type
         self.engine = None
         self.current_speed = 150  # words per minute
         self.current_volume = 1.0  # 0.0 to 1.0
+        self.synthesizer = synthesizer or gtts_synthesizer
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self.last_encode_stats = None
         
         if engine_type == "pyttsx3":
             self.engine = pyttsx3.init()
@@ -62,39 +107,56 @@ class TTSEngine:
         if self.engine_type == "pyttsx3" and self.engine:
             self.engine.setProperty('volume', self.current_volume)
     
-    def text_to_speech_pyttsx3(self, text: str, output_file: str) -> bool:
+    def text_to_speech_pyttsx3(self, text: str, output_file: str,
+                               progress_callback: Optional[Callable[[int, int], None]] = None,
+                               cancel_event: Optional[threading.Event] = None) -> bool:
         """
-        Convert text to speech using pyttsx3 and save as MP3.
+        Convert text to speech using pyttsx3 and save as MP3, OGG, Opus or WAV.
         
         Args:
             text: Text to convert
             output_file: Output file path
+            progress_callback: Called as (chunks_done, total_chunks) after each chunk
+            cancel_event: Stops the conversion between chunks when set
             
         Returns:
             True if successful, False otherwise
         """
+        if not self._check_output_format(output_file, "pyttsx3"):
+            return False
         try:
             if not self.engine:
                 self.engine = pyttsx3.init()
                 self._setup_pyttsx3()
             
-            # Save as WAV first (pyttsx3 limitation)
-            wav_file = output_file.replace('.mp3', '.wav')
-            self.engine.save_to_file(text, wav_file)
-            self.engine.runAndWait()
+            # Save as WAV first (pyttsx3 limitation); WAV output is written in place
+            wav_file = os.path.splitext(output_file)[0] + '.wav' if is_supported(output_file) else output_file
+            if self.cache is None and progress_callback is None and cancel_event is None:
+                self.engine.save_to_file(text, wav_file)
+                self.engine.runAndWait()
+            else:
+                self._synthesize_pyttsx3_chunks(text, wav_file, progress_callback, cancel_event)
             
-            # Convert WAV to MP3 if needed
-            if output_file.endswith('.mp3'):
-                self._convert_wav_to_mp3(wav_file, output_file)
-                if os.path.exists(wav_file):
-                    os.remove(wav_file)
+            # Stream the WAV through the encoder if a compressed format was requested
+            if is_supported(output_file):
+                try:
+                    self.last_encode_stats = transcode_wav(wav_file, output_file)
+                finally:
+                    if os.path.exists(wav_file):
+                        os.remove(wav_file)
+                print(f"Encoded {os.path.basename(output_file)} at "
+                      f"{self.last_encode_stats['realtime_factor']:.0f}x realtime")
             
             return True
+        except ConversionCancelled:
+            return False
         except Exception as e:
             print(f"Error in pyttsx3 conversion: {e}")
             return False
     
-    def text_to_speech_gtts(self, text: str, output_file: str, lang: str = 'en') -> bool:
+    def text_to_speech_gtts(self, text: str, output_file: str, lang: str = 'en',
+                            progress_callback: Optional[Callable[[int, int], None]] = None,
+                            cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Convert text to speech using gTTS and save as MP3.
         
@@ -102,77 +164,205 @@ class TTSEngine:
             text: Text to convert
             output_file: Output file path
             lang: Language code (default: 'en')
+            progress_callback: Called as (chunks_done, total_chunks) after each chunk
+            cancel_event: Stops the conversion between chunks when set
             
         Returns:
             True if successful, False otherwise
         """
+        if not self._check_output_format(output_file, "gtts"):
+            return False
         try:
             # Split text into chunks (gTTS has character limit)
-            chunks = self._split_text(text, 3000)
+            chunks = self._split_text(text, GTTS_CHUNK_LENGTH)
             
-            if len(chunks) == 1:
-                tts = gTTS(text=chunks[0], lang=lang, slow=False)
-                tts.save(output_file)
-            else:
-                # Combine multiple chunks
-                from pydub import AudioSegment
-                combined = AudioSegment.empty()
-                
-                for i, chunk in enumerate(chunks):
-                    temp_file = f"temp_chunk_{i}.mp3"
-                    tts = gTTS(text=chunk, lang=lang, slow=False)
-                    tts.save(temp_file)
-                    combined += AudioSegment.from_mp3(temp_file)
-                    os.remove(temp_file)
-                
-                combined.export(output_file, format="mp3")
+            # Each conversion gets its own temp directory so parallel jobs never collide
+            with tempfile.TemporaryDirectory(prefix="tts_job_") as job_dir:
+                chunk_files = self._synthesize_chunks(chunks, job_dir, lang, progress_callback,
+                                                      cancel_event)
+                self._concatenate_mp3(chunk_files, output_file)
             
             return True
+        except ConversionCancelled:
+            return False
         except Exception as e:
             print(f"Error in gTTS conversion: {e}")
             return False
     
-    def convert_to_speech(self, text: str, output_file: str) -> bool:
+    @staticmethod
+    def _check_output_format(output_file: str, engine_type: str) -> bool:
+        """Check that the engine can write the output file's extension, printing an error if not."""
+        extension = os.path.splitext(output_file)[1].lower()
+        if extension in OUTPUT_FORMATS[engine_type]:
+            return True
+        print(f"{engine_type} cannot write '{extension or output_file}' files; "
+              f"use one of {', '.join(OUTPUT_FORMATS[engine_type])}")
+        return False
+    
+    def convert_to_speech(self, text: str, output_file: str,
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Convert text to speech using configured engine.
         
         Args:
             text: Text to convert
             output_file: Output file path
+            progress_callback: Called as (chunks_done, total_chunks) after each chunk
+            cancel_event: Stops the conversion between chunks when set
             
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise (including when cancelled)
         """
         if self.engine_type == "pyttsx3":
-            return self.text_to_speech_pyttsx3(text, output_file)
+            return self.text_to_speech_pyttsx3(text, output_file, progress_callback, cancel_event)
         else:
-            return self.text_to_speech_gtts(text, output_file)
+            return self.text_to_speech_gtts(text, output_file, progress_callback=progress_callback,
+                                            cancel_event=cancel_event)
     
-    @staticmethod
-    def _split_text(text: str, max_length: int) -> list:
-        """Split text into chunks for processing."""
-        chunks = []
-        current_chunk = ""
+    def _synthesize_pyttsx3_chunks(self, text: str, wav_file: str,
+                                   progress_callback: Optional[Callable[[int, int], None]] = None,
+                                   cancel_event: Optional[threading.Event] = None):
+        """Synthesize text chunk by chunk, reusing cached WAVs for unchanged chunks."""
+        chunks = self._split_text(text, PYTTSX3_CHUNK_LENGTH)
+        voice = self.engine.getProperty('voice')
         
-        for sentence in text.split('.'):
-            if len(current_chunk) + len(sentence) < max_length:
-                current_chunk += sentence + "."
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sentence + "."
+        with tempfile.TemporaryDirectory(prefix="tts_job_") as job_dir:
+            chunk_files = []
+            for i, chunk in enumerate(chunks):
+                _check_cancelled(cancel_event)
+                chunk_file = os.path.join(job_dir, f"chunk_{i:05d}.wav")
+                self._synthesize_pyttsx3_chunk(chunk, chunk_file, voice)
+                chunk_files.append(chunk_file)
+                if progress_callback:
+                    progress_callback(i + 1, len(chunks))
+            
+            self._concatenate_wav(chunk_files, wav_file)
+    
+    def _synthesize_pyttsx3_chunk(self, chunk: str, chunk_file: str, voice: str):
+        """Synthesize one pyttsx3 chunk to WAV, or copy it from the cache when unchanged."""
+        key = AudioCache.make_key(chunk, "pyttsx3", voice, self.current_speed,
+                                  self.current_volume, None)
+        if self.cache is None or not self.cache.fetch(key, ".wav", chunk_file):
+            self.engine.save_to_file(chunk, chunk_file)
+            self.engine.runAndWait()
+            if self.cache is not None:
+                self.cache.put(key, ".wav", chunk_file)
+    
+    def synthesize_chunk(self, text: str, output_base: str, lang: str = 'en',
+                         cancel_event: Optional[threading.Event] = None) -> str:
+        """
+        Synthesize one chunk of text to a playable file.
+        
+        Args:
+            text: Chunk text (at most chunk_length() characters)
+            output_base: Output path without extension; pyttsx3 writes WAV, gTTS MP3
+            lang: Language code for gTTS
+            cancel_event: Skips the chunk when set
+            
+        Returns:
+            Path of the written file
+            
+        Raises:
+            ConversionCancelled: If cancel_event is set
+        """
+        _check_cancelled(cancel_event)
+        if self.engine_type == "pyttsx3":
+            if not self.engine:
+                self.engine = pyttsx3.init()
+                self._setup_pyttsx3()
+            chunk_file = output_base + '.wav'
+            self._synthesize_pyttsx3_chunk(text, chunk_file, self.engine.getProperty('voice'))
+        else:
+            chunk_file = output_base + '.mp3'
+            self._synthesize_chunk(text, chunk_file, lang)
+        return chunk_file
+    
+    def chunk_length(self) -> int:
+        """Maximum characters the configured engine synthesizes per chunk."""
+        return PYTTSX3_CHUNK_LENGTH if self.engine_type == "pyttsx3" else GTTS_CHUNK_LENGTH
+    
+    def _synthesize_chunk(self, chunk: str, chunk_file: str, lang: str,
+                          cancel_event: Optional[threading.Event] = None):
+        """Synthesize one gTTS chunk, or copy it from the cache when unchanged."""
+        _check_cancelled(cancel_event)
+        if self.cache is None:
+            self.synthesizer(chunk, chunk_file, lang)
+            return
+        
+        engine = getattr(self.synthesizer, '__qualname__', type(self.synthesizer).__name__)
+        # gTTS ignores the speed and volume settings, so they must not split the cache
+        key = AudioCache.make_key(chunk, engine, None, None, None, lang)
+        if not self.cache.fetch(key, ".mp3", chunk_file):
+            self.synthesizer(chunk, chunk_file, lang)
+            self.cache.put(key, ".mp3", chunk_file)
+    
+    def _synthesize_chunks(self, chunks: List[str], job_dir: str, lang: str,
+                           progress_callback: Optional[Callable[[int, int], None]] = None,
+                           cancel_event: Optional[threading.Event] = None) -> List[str]:
+        """
+        Synthesize chunks concurrently on a bounded thread pool.
+        
+        Args:
+            chunks: Text chunks in reading order
+            job_dir: Directory private to this conversion for chunk files
+            lang: Language code passed to the synthesizer
+            progress_callback: Called as (chunks_done, total_chunks) as chunks finish
+            cancel_event: Skips chunks not yet started when set
+            
+        Returns:
+            Chunk file paths in the same order as chunks
+        """
+        chunk_files = [os.path.join(job_dir, f"chunk_{i:05d}.mp3") for i in range(len(chunks))]
+        workers = min(self.max_workers, len(chunks)) or 1
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._synthesize_chunk, chunk, path, lang, cancel_event)
+                       for chunk, path in zip(chunks, chunk_files)]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    if progress_callback:
+                        progress_callback(done, len(chunks))
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
         
-        return chunks
+        return chunk_files
     
     @staticmethod
-    def _convert_wav_to_mp3(wav_file: str, mp3_file: str):
-        """Convert WAV to MP3 using pydub."""
-        try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_wav(wav_file)
-            audio.export(mp3_file, format="mp3")
-        except Exception as e:
-            print(f"Error converting WAV to MP3: {e}")
+    def _concatenate_mp3(chunk_files: List[str], output_file: str):
+        """
+        Join MP3 chunk files into one file in a single streaming pass.
+        
+        MP3 streams are sequences of independent frames, so the chunks can be
+        written back to back without decoding them.
+        """
+        with open(output_file, 'wb') as out:
+            for chunk_file in chunk_files:
+                with open(chunk_file, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+    
+    @staticmethod
+    def _concatenate_wav(chunk_files: List[str], output_file: str, frames_per_block: int = 65536):
+        """Join WAV chunk files with identical formats, streaming frames in blocks."""
+        with wave.open(chunk_files[0], 'rb') as first:
+            params = first.getparams()
+        
+        with wave.open(output_file, 'wb') as out:
+            out.setparams(params)
+            for chunk_file in chunk_files:
+                with wave.open(chunk_file, 'rb') as chunk:
+                    if chunk.getparams()[:3] != params[:3]:
+                        raise ValueError(f"WAV format mismatch in {chunk_file}")
+                    while True:
+                        frames = chunk.readframes(frames_per_block)
+                        if not frames:
+                            break
+                        out.writeframes(frames)
+    
+    @staticmethod
+    def _split_text(text: str, max_length: int) -> list:
+        """Split text into chunks of at most max_length characters at sentence boundaries."""
+        return [chunk for _, chunk in iter_text_chunks(text, max_length)]
@@ -0,0 +1,132 @@
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from PIL import Image, ImageChops, ImageStat
+from image_resizer import RENDITIONS, _load_scaled, render_renditions, resize_images
+
+
+def make_corpus(folder, count=40, size=(6000, 4000), seed=0):
+    """
+    Write synthetic test images: noisy gradients, mostly JPEG with some PNG,
+    RGBA and grayscale files so the conversion paths are exercised.
+    Args:
+        folder (str): Folder to write the images to.
+        count (int): Number of images.
+        size (tuple): Image size as (width, height).
+        seed (int): Random seed, so runs are comparable.
+    """
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    base = Image.linear_gradient("L").resize(size)
+    for i in range(count):
+        noise = Image.effect_noise(size, rng.randint(20, 60))
+        red = Image.blend(base, noise, 0.3)
+        img = Image.merge("RGB", (red, base.rotate(90, expand=False), noise))
+        if i % 10 == 3:
+            img.convert("RGBA").save(os.path.join(folder, f"synthetic_{i:04d}.png"))
+        elif i % 10 == 7:
+            img.convert("L").save(os.path.join(folder, f"synthetic_{i:04d}.jpg"), quality=90)
+        else:
+            img.save(os.path.join(folder, f"synthetic_{i:04d}.jpg"), quality=90)
+
+
+def psnr(reference, candidate):
+    """Peak signal-to-noise ratio in dB between two RGB images of the same size."""
+    diff = ImageStat.Stat(ImageChops.difference(reference, candidate))
+    mse = sum(rms ** 2 for rms in diff.rms) / len(diff.rms)
+    return 10 * math.log10(255 ** 2 / mse) if mse else float('inf')
+
+
+def compare_paths(folder, target_size=(800, 600), output_format='JPEG'):
+    """
+    Time the full-decode path against the draft/reducing_gap fast path on
+    every image in folder, and measure how far the fast output drifts.
+    Returns:
+        dict: Seconds per path and the mean and worst PSNR of fast vs full.
+    """
+    full_seconds = fast_seconds = 0.0
+    scores = []
+    for filename in sorted(os.listdir(folder)):
+        file_path = os.path.join(folder, filename)
+
+        start = time.perf_counter()
+        with Image.open(file_path) as img:
+            reference = img.convert("RGB").resize(target_size, Image.LANCZOS)
+        full_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with Image.open(file_path) as img:
+            fast = _load_scaled(img, target_size, output_format)
+        fast_seconds += time.perf_counter() - start
+
+        scores.append(psnr(reference, fast.convert("RGB")))
+    return {
+        'full_seconds': full_seconds,
+        'fast_seconds': fast_seconds,
+        'mean_psnr': sum(scores) / len(scores),
+        'min_psnr': min(scores),
+    }
+
+
+def compare_renditions(folder, work_dir, output_formats=('JPEG',)):
+    """
+    Time the rendition set rendered in one pass (one decode per image) against
+    one resize_images pass per size.
+    Returns:
+        dict: Seconds for the single cascaded pass and for the separate passes.
+    """
+    start = time.perf_counter()
+    render_renditions(folder, os.path.join(work_dir, "renditions"), RENDITIONS, output_formats,
+                      workers=1, verbose=False)
+    cascade_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, box in RENDITIONS.items():
+        for output_format in output_formats:
+            resize_images(folder, os.path.join(work_dir, f"{name}_{output_format}"), box, output_format,
+                          workers=1, verbose=False)
+    separate_seconds = time.perf_counter() - start
+    return {'cascade_seconds': cascade_seconds, 'separate_seconds': separate_seconds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark image_resizer on synthetic images")
+    parser.add_argument("--count", type=int, default=40)
+    # 24 MP, like a camera photo; draft mode only reduces sources at least 4x the 800x600 target
+    parser.add_argument("--size", type=int, nargs=2, default=(6000, 4000), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument("--workers", type=int, nargs='+', default=None,
+                        help="Worker counts to compare (default: 1 and CPU count)")
+    parser.add_argument("--compare", action='store_true',
+                        help="Compare full decoding with the draft/reducing_gap fast path instead")
+    parser.add_argument("--renditions", action='store_true',
+                        help="Compare one rendition-set pass with one pass per size instead")
+    args = parser.parse_args()
+    worker_counts = args.workers or sorted({1, os.cpu_count() or 1})
+
+    with tempfile.TemporaryDirectory(prefix="resize_bench_") as work_dir:
+        corpus = os.path.join(work_dir, "images")
+        print(f"Generating {args.count} images of {args.size[0]}x{args.size[1]}...")
+        make_corpus(corpus, args.count, tuple(args.size))
+
+        if args.compare:
+            result = compare_paths(corpus)
+            print(f"Full decode: {result['full_seconds'] / args.count * 1000:.0f} ms/image")
+            print(f"Fast path:   {result['fast_seconds'] / args.count * 1000:.0f} ms/image "
+                  f"({result['full_seconds'] / result['fast_seconds']:.1f}x faster)")
+            print(f"PSNR vs full decode: {result['mean_psnr']:.1f} dB mean, {result['min_psnr']:.1f} dB worst")
+        elif args.renditions:
+            result = compare_renditions(corpus, work_dir)
+            print(f"Rendition set in one pass: {result['cascade_seconds']:.2f}s")
+            print(f"One pass per size:         {result['separate_seconds']:.2f}s "
+                  f"({result['separate_seconds'] / result['cascade_seconds']:.1f}x slower)")
+        else:
+            print(f"{'workers':>8} {'seconds':>8} {'images/s':>9} {'MB in':>7} {'MB out':>7} {'failed':>7}")
+            for workers in worker_counts:
+                summary = resize_images(corpus, os.path.join(work_dir, f"out_{workers}"),
+                                        workers=workers, verbose=False)
+                print(f"{workers:>8} {summary['elapsed']:>8.2f} {summary['images_per_sec']:>9.1f} "
+                      f"{summary['bytes_in'] / 1024 ** 2:>7.1f} {summary['bytes_out'] / 1024 ** 2:>7.1f} "
+                      f"{summary['failed']:>7}")
@@ -1,7 +1,224 @@
+import argparse
+import hashlib
+import io
+import json
 import os
-from PIL import Image
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from PIL import Image, UnidentifiedImageError
 
-def resize_images(input_folder, output_folder, target_size=(800, 600), output_format='JPEG'):
+# Image modes each output format can store without converting
+SAVE_MODES = {
+    'JPEG': ('RGB', 'L'),
+    'PNG': ('RGB', 'RGBA', 'L', 'LA'),
+    'WEBP': ('RGB', 'RGBA'),
+}
+
+# Default rendition set: name -> bounding box (width, height)
+RENDITIONS = {
+    'large': (1600, 1200),
+    'medium': (800, 600),
+    'thumb': (200, 150),
+}
+
+# Written to the output folder by incremental runs
+MANIFEST_FILE = ".resize_manifest.json"
+
+# Keep at least this much resolution above the target before the final
+# Lanczos pass; 2.0 is visually indistinguishable from a full-size resize
+REDUCING_GAP = 2.0
+
+
+def _output_mode(img, output_format):
+    """Return the mode to convert img to before saving, or None if it can be saved as is."""
+    allowed = SAVE_MODES.get(output_format.upper(), ('RGB',))
+    if img.mode in allowed:
+        return None
+    has_alpha = 'A' in img.mode or 'transparency' in img.info
+    return 'RGBA' if has_alpha and 'RGBA' in allowed else 'RGB'
+
+
+def _load_scaled(img, target_size, output_format):
+    """
+    Fast path: let the JPEG decoder downscale while decoding (draft mode),
+    convert only when the output format cannot store the mode, then reduce
+    and resize in steps.
+    """
+    width, height = target_size
+    # A no-op for formats other than JPEG
+    img.draft(None, (int(width * REDUCING_GAP), int(height * REDUCING_GAP)))
+    mode = _output_mode(img, output_format)
+    if mode is not None:
+        img = img.convert(mode)
+    return img.resize(target_size, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def _file_hash(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _render_resized(img, base_name, output_folder, target_size, output_format, fast=True):
+    """Resize img to exactly target_size and save it; returns the output paths."""
+    if fast:
+        img_resized = _load_scaled(img, target_size, output_format)
+    else:
+        img = img.convert("RGB")  # Ensures compatibility
+        img_resized = img.resize(target_size, Image.LANCZOS)
+    output_file = os.path.join(output_folder, f"{base_name}.{output_format.lower()}")
+    img_resized.save(output_file, output_format)
+    return [output_file]
+
+
+def _scaled_size(size, box, mode):
+    """
+    Size to scale an image of `size` to for a bounding box: 'fit' fits inside
+    the box without upscaling, 'fill' covers the box (the excess is cropped).
+    Both preserve the aspect ratio.
+    """
+    width, height = size
+    if mode == 'fill':
+        scale = max(box[0] / width, box[1] / height)
+    elif mode == 'fit':
+        scale = min(box[0] / width, box[1] / height, 1.0)
+    else:
+        raise ValueError(f"Unknown rendition mode: {mode}")
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _crop_center(img, box):
+    left = (img.width - box[0]) // 2
+    top = (img.height - box[1]) // 2
+    return img.crop((left, top, left + box[0], top + box[1]))
+
+
+def _render_set(img, base_name, output_folder, renditions, output_formats, mode='fit'):
+    """
+    Render every size in renditions from one decode. Sizes are produced
+    largest first, each resized from the previous (uncropped) one unless that
+    was enlarged, and every size is saved in every format. Returns the output paths.
+    """
+    # Order by the size each rendition actually gets, not by its box: a wide
+    # banner box can yield a smaller image than a square one
+    sizes = sorted(((name, box, _scaled_size(img.size, box, mode)) for name, box in renditions.items()),
+                   key=lambda item: item[2][0] * item[2][1], reverse=True)
+
+    # Decode only as much resolution as the largest rendition needs
+    largest = sizes[0][2]
+    img.draft(None, (int(largest[0] * REDUCING_GAP), int(largest[1] * REDUCING_GAP)))
+    # Convert up front only if no format can store the mode; otherwise per format when saving
+    modes = {_output_mode(img, output_format) for output_format in output_formats}
+    if None not in modes:
+        img = img.convert('RGBA' if 'RGBA' in modes else 'RGB')
+
+    outputs = []
+    for name, box, size in sizes:
+        scaled = img.resize(size, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+        if size[0] <= img.width and size[1] <= img.height:
+            img = scaled  # Smaller sizes continue from here; never from an upscaled copy
+        rendition = _crop_center(scaled, box) if mode == 'fill' else scaled
+        for output_format in output_formats:
+            converted_mode = _output_mode(rendition, output_format)
+            out = rendition.convert(converted_mode) if converted_mode else rendition
+            output_file = os.path.join(output_folder, f"{base_name}_{name}.{output_format.lower()}")
+            out.save(output_file, output_format)
+            outputs.append(output_file)
+    return outputs
+
+
+def _process_one(file_path, output_folder, render, render_args, record=False):
+    """
+    Decode a single image and write its outputs with render (runs in a worker process).
+    With record=True the result also carries the source's size, mtime and
+    content hash for the incremental manifest; the file is read only once.
+    Errors are captured in the result instead of raised, so one bad file
+    does not stop the run.
+    Returns:
+        dict: Source and output paths, bytes in/out, and the error message if it failed.
+    """
+    result = {'source': file_path, 'outputs': [], 'bytes_in': 0, 'bytes_out': 0, 'error': None}
+    try:
+        stat = os.stat(file_path)
+        result['bytes_in'] = stat.st_size
+        source = file_path
+        if record:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            result['stat'] = (stat.st_size, stat.st_mtime)
+            result['sha256'] = hashlib.sha256(data).hexdigest()
+            source = io.BytesIO(data)
+        base_name, _ = os.path.splitext(os.path.basename(file_path))
+        with Image.open(source) as img:
+            result['outputs'] = render(img, base_name, output_folder, *render_args)
+        result['bytes_out'] = sum(os.path.getsize(output) for output in result['outputs'])
+    except UnidentifiedImageError:
+        # Name the file even when it was opened from memory, not the buffer's repr
+        result['error'] = f"UnidentifiedImageError: cannot identify image file {file_path!r}"
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def load_manifest(output_folder):
+    """Load the incremental manifest of output_folder, or an empty one."""
+    try:
+        with open(os.path.join(output_folder, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(output_folder, manifest):
+    """Atomically write the incremental manifest of output_folder."""
+    path = os.path.join(output_folder, MANIFEST_FILE)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+
+def _is_up_to_date(entry, file_path, stat, settings, output_folder):
+    """
+    Check a manifest entry against the source and settings. Size and mtime
+    are compared first; the content is only hashed when they changed, so a
+    touched but identical file is not re-rendered.
+    """
+    if entry is None or entry['settings'] != settings:
+        return False
+    outputs = entry.get('outputs')
+    if not outputs or not all(os.path.exists(os.path.join(output_folder, output)) for output in outputs):
+        return False
+    if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+        return True
+    if entry['size'] == stat.st_size and entry['sha256'] == _file_hash(file_path):
+        entry['mtime'] = stat.st_mtime
+        return True
+    return False
+
+
+def _output_refcount(manifest):
+    """Count the manifest entries referencing each output file."""
+    refcount = Counter()
+    for entry in manifest.values():
+        refcount.update(entry.get('outputs', ()))
+    return refcount
+
+
+def _remove_outputs(manifest, name, output_folder, refcount):
+    """Drop a manifest entry and delete the outputs no other entry references."""
+    for output in manifest.pop(name).get('outputs', ()):
+        refcount[output] -= 1
+        if refcount[output] <= 0:
+            del refcount[output]
+            try:
+                os.remove(os.path.join(output_folder, output))
+            except FileNotFoundError:
+                pass
+
+
+def resize_images(input_folder, output_folder, target_size=(800, 600), output_format='JPEG',
+                  workers=None, verbose=True, fast=True, incremental=False):
     """
     Resize and convert all images in input_folder, save to output_folder.
     Args:
@@ -9,31 +226,162 @@ def resize_images(input_folder, output_folder, target_size=(800, 600), output_fo
         output_folder (str): Path to the folder to save resized images.
         target_size (tuple): Target size as (width, height).
         output_format (str): Format to save images (e.g., 'JPEG', 'PNG').
+        workers (int): Worker processes (default: CPU count); 1 resizes in this process.
+        verbose (bool): Print a line per file.
+        fast (bool): Decode JPEGs at reduced size and downscale in steps; False
+            decodes every image at full resolution.
+        incremental (bool): Skip images whose source and settings match the
+            manifest in output_folder, and delete outputs whose sources are gone.
+    Returns:
+        dict: Run summary with processed/failed/skipped/pruned counts, per-file
+        errors, elapsed seconds, images per second and total bytes in/out.
     """
+    settings = {'target_size': list(target_size), 'format': output_format.upper(), 'fast': fast}
+    return _run(input_folder, output_folder, _render_resized, (target_size, output_format, fast),
+                settings, workers, verbose, incremental)
+
+
+def render_renditions(input_folder, output_folder, renditions=None, output_formats=('JPEG',),
+                      mode='fit', workers=None, verbose=True, incremental=False):
+    """
+    Render a set of sizes in one or more formats for all images in input_folder.
+    Each image is decoded once and resized down through the sizes, largest
+    first; outputs are named <name>_<rendition>.<format>.
+    Args:
+        input_folder (str): Path to the folder containing input images.
+        output_folder (str): Path to the folder to save the renditions.
+        renditions (dict): Rendition name -> bounding box (width, height); defaults to RENDITIONS.
+        output_formats (tuple): Formats to save every rendition in (e.g., 'JPEG', 'WEBP', 'PNG').
+        mode (str): 'fit' to fit inside each box, 'fill' to cover it and crop the excess.
+        workers (int): Worker processes (default: CPU count); 1 renders in this process.
+        verbose (bool): Print a line per file.
+        incremental (bool): Skip images whose source and settings match the
+            manifest in output_folder, and delete outputs whose sources are gone.
+    Returns:
+        dict: Run summary, as for resize_images.
+    """
+    renditions = dict(renditions or RENDITIONS)
+    output_formats = tuple(output_format.upper() for output_format in output_formats)
+    _scaled_size((1, 1), (1, 1), mode)  # Reject unknown modes before starting workers
+    settings = {'renditions': {name: list(box) for name, box in renditions.items()},
+                'formats': list(output_formats), 'mode': mode}
+    return _run(input_folder, output_folder, _render_set, (renditions, output_formats, mode),
+                settings, workers, verbose, incremental)
+
+
+def _run(input_folder, output_folder, render, render_args, settings, workers, verbose, incremental):
+    """Render every file in input_folder on a process pool and summarize the run."""
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    for filename in os.listdir(input_folder):
-        file_path = os.path.join(input_folder, filename)
-        if not os.path.isfile(file_path):
-            continue
-
-        try:
-            with Image.open(file_path) as img:
-                img = img.convert("RGB")  # Ensures compatibility
-                img_resized = img.resize(target_size, Image.ANTIALIAS)
-                base_name, _ = os.path.splitext(filename)
-                output_file = os.path.join(output_folder, f"{base_name}.{output_format.lower()}")
-                img_resized.save(output_file, output_format)
-                print(f"Resized and saved: {output_file}")
-        except Exception as e:
-            print(f"Failed to process {filename}: {e}")
+    start = time.perf_counter()
+    with os.scandir(input_folder) as entries:
+        sources = sorted((entry.name, entry.path, entry.stat()) for entry in entries if entry.is_file())
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    skipped = pruned = 0
+    if incremental:
+        manifest = load_manifest(output_folder)
+        refcount = _output_refcount(manifest)
+        names = {name for name, _, _ in sources}
+        for name in [name for name in manifest if name not in names]:
+            _remove_outputs(manifest, name, output_folder, refcount)
+            pruned += 1
+        files = []
+        for name, file_path, stat in sources:
+            if _is_up_to_date(manifest.get(name), file_path, stat, settings, output_folder):
+                skipped += 1
+            else:
+                files.append(file_path)
+    else:
+        files = [file_path for _, file_path, _ in sources]
+
+    args = (files, repeat(output_folder), repeat(render), repeat(render_args), repeat(incremental))
+    if workers == 1 or len(files) < 2:
+        results = list(map(_process_one, *args))
+    else:
+        # Hand out files in batches so small images are not dominated by IPC overhead
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_process_one, *args, chunksize=chunksize))
+    errors = []
+    for result in results:
+        filename = os.path.basename(result['source'])
+        if result['error']:
+            errors.append((filename, result['error']))
+            if verbose:
+                print(f"Failed to process {filename}: {result['error']}")
+        elif verbose:
+            print(f"Resized and saved: {', '.join(result['outputs'])}")
+
+    if incremental:
+        rendered = [result for result in results if not result['error']]
+        # Count the new outputs first so replacing an entry never deletes a file just written
+        for result in rendered:
+            refcount.update(os.path.basename(output) for output in result['outputs'])
+        for result in rendered:
+            name = os.path.basename(result['source'])
+            outputs = [os.path.basename(output) for output in result['outputs']]
+            if name in manifest:
+                _remove_outputs(manifest, name, output_folder, refcount)
+            size, mtime = result['stat']
+            manifest[name] = {'size': size, 'mtime': mtime, 'sha256': result['sha256'],
+                              'settings': settings, 'outputs': outputs}
+        save_manifest(output_folder, manifest)
+
+    processed = len(results) - len(errors)
+    elapsed = time.perf_counter() - start
+    return {
+        'processed': processed,
+        'failed': len(errors),
+        'skipped': skipped,
+        'pruned': pruned,
+        'errors': errors,
+        'elapsed': elapsed,
+        'images_per_sec': processed / elapsed if elapsed else 0.0,
+        'bytes_in': sum(result['bytes_in'] for result in results if not result['error']),
+        'bytes_out': sum(result['bytes_out'] for result in results),
+    }
+
+
+def print_summary(summary):
+    """Print a run summary returned by resize_images or render_renditions."""
+    print(f"\nProcessed {summary['processed']} images, {summary['failed']} failed "
+          f"in {summary['elapsed']:.2f}s ({summary['images_per_sec']:.1f} images/sec)")
+    if summary['skipped'] or summary['pruned']:
+        print(f"Skipped {summary['skipped']} unchanged images, pruned {summary['pruned']} orphaned outputs")
+    print(f"Bytes in: {summary['bytes_in'] / 1024 ** 2:.1f} MB, "
+          f"bytes out: {summary['bytes_out'] / 1024 ** 2:.1f} MB")
+    for filename, error in summary['errors']:
+        print(f"  {filename}: {error}")
+
 
 if __name__ == "__main__":
-    # Example usage
-    input_folder = "images"
-    output_folder = "resized"
-    target_size = (800, 600)  # Change as needed
-    output_format = "JPEG"    # Change as needed
+    parser = argparse.ArgumentParser(description="Resize and convert all images in a folder")
+    parser.add_argument("input_folder", nargs='?', default="images")
+    parser.add_argument("output_folder", nargs='?', default="resized")
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 600), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument("--format", default="JPEG", help="Output format, e.g. JPEG or PNG")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--quiet", action='store_true', help="Only print the summary")
+    parser.add_argument("--full-decode", action='store_true',
+                        help="Decode every image at full resolution (slower, for comparison)")
+    parser.add_argument("--incremental", action='store_true',
+                        help="Only render new or changed images and prune outputs of deleted ones")
+    parser.add_argument("--renditions", action='store_true',
+                        help="Render the large/medium/thumb set instead of one size")
+    parser.add_argument("--formats", nargs='+', default=["JPEG"],
+                        help="Formats for --renditions, e.g. JPEG WEBP PNG")
+    parser.add_argument("--mode", choices=["fit", "fill"], default="fit",
+                        help="Fit inside each rendition box or fill it and crop")
+    args = parser.parse_args()
 
-    resize_images(input_folder, output_folder, target_size, output_format)
+    if args.renditions:
+        summary = render_renditions(args.input_folder, args.output_folder, RENDITIONS, args.formats,
+                                    args.mode, workers=args.workers, verbose=not args.quiet,
+                                    incremental=args.incremental)
+    else:
+        summary = resize_images(args.input_folder, args.output_folder, tuple(args.size), args.format,
+                                workers=args.workers, verbose=not args.quiet, fast=not args.full_decode,
+                                incremental=args.incremental)
+    print_summary(summary)